@@ -0,0 +1 @@
+"""Benchmarks for the institute package; run each module with ``python -m``."""
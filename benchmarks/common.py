@@ -0,0 +1,74 @@
+"""Shared helpers for the benchmark scripts."""
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from typing import Callable, TypeVar
+
+from institute import Course, Department, Faculty, Group, Institute, Student
+
+T = TypeVar("T")
+
+FIRST_NAMES = ("Alice", "Bob", "Carol", "David", "Eve", "Frank", "Grace", "Heidi", "Ivan", "Judy")
+LAST_NAMES = ("Anderson", "Baker", "Clark", "Doe", "Evans", "Fisher", "Garcia", "Hill", "Irwin", "Jones")
+
+
+def build_institute(
+    student_count: int,
+    group_size: int = 25,
+    groups_per_department: int = 8,
+    departments_per_faculty: int = 5,
+    faculties_per_course: int = 4,
+    seed: int = 0,
+) -> Institute:
+    """Generate a synthetic institute spread evenly over six courses."""
+    rng = random.Random(seed)
+    institute = Institute("Benchmark Institute")
+    student_number = 0
+    course_number = 0
+    while student_number < student_count:
+        course_number += 1
+        course_index = (course_number - 1) % 6 + 1
+        course = institute.find_course(course_index)
+        if course is None:
+            course = Course(course_index)
+            institute.add_course(course)
+        faculty = Faculty(f"Faculty {course_number}-{len(course.faculties) + 1}")
+        for d in range(departments_per_faculty):
+            department = Department(f"Department {d + 1}")
+            for g in range(groups_per_department):
+                students = []
+                for _ in range(group_size):
+                    if student_number >= student_count:
+                        break
+                    student_number += 1
+                    students.append(
+                        Student(
+                            rng.choice(FIRST_NAMES),
+                            rng.choice(LAST_NAMES),
+                            f"S{student_number:07d}",
+                            round(rng.uniform(40.0, 100.0), 2),
+                        )
+                    )
+                department.add_group(Group(f"Group {g + 1}", students=students))
+            faculty.add_department(department)
+        course.add_faculty(faculty)
+    return institute
+
+
+def measure(action: Callable[[], T]) -> tuple[T, float, int]:
+    """Run ``action`` and return its result, elapsed seconds and peak traced bytes."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = action()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def megabytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
@@ -0,0 +1,96 @@
+"""Stress the institute's reader-writer lock: reader threads run lookups while a
+writer thread keeps changing grades and adding and removing students."""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import threading
+import time
+
+from institute import Institute, Student
+
+from .common import build_institute
+
+
+def run(
+    institute: Institute, readers: int, with_writer: bool, seconds: float, write_pause: float = 0.001
+) -> tuple[float, float]:
+    """Return reads and writes per second over ``seconds``."""
+    student_ids = [path[-1].student_id for path in institute.find_students_by_name("")]
+    groups = [path[3] for path in institute.find_students_by_name("")][::25]
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def read(slot: int) -> None:
+        rng = random.Random(slot)
+        done = 0
+        while not stop.is_set():
+            with institute.reading():
+                path = institute.find_student_by_id(rng.choice(student_ids))
+                assert path is not None
+                path[3].grade_stats()
+            done += 1
+        reads[slot] = done
+
+    def write() -> None:
+        rng = random.Random(-1)
+        serial = 0
+        while not stop.is_set():
+            with institute.writing():
+                path = institute.find_student_by_id(rng.choice(student_ids))
+                assert path is not None
+                path[-1].update_average_grade(round(rng.uniform(0.0, 100.0), 2))
+                group = rng.choice(groups)
+                serial += 1
+                group.add_student(Student("Stress", "Writer", f"W{serial}", 50.0))
+                group.remove_student(f"W{serial}")
+            writes[0] += 1
+            # Under the GIL a busy reader only yields every switch interval, so the
+            # write rate is bounded by that interval rather than by the lock.
+            time.sleep(write_pause)
+
+    threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+    if with_writer:
+        threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, writes[0] / seconds
+
+
+def check(institute: Institute) -> None:
+    """Compare the running totals and the ID index with a fresh traversal."""
+    paths = institute.find_students_by_name("")
+    stats = institute.grade_stats()
+    assert stats.count == len(paths)
+    assert math.isclose(stats.total, sum(path[-1].average_grade for path in paths), rel_tol=1e-9)
+    assert all(institute.find_student_by_id(path[-1].student_id) is not None for path in paths)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--write-pause", type=float, default=0.001, help="writer sleep between writes")
+    args = parser.parse_args()
+
+    institute = build_institute(args.students)
+    print(f"{args.students} students, {args.seconds:g} s per run")
+    for readers in args.readers:
+        alone, _ = run(institute, readers, False, args.seconds)
+        shared, writes = run(institute, readers, True, args.seconds, args.write_pause)
+        check(institute)
+        print(
+            f"{readers:>2} reader(s): {alone:10,.0f} reads/s alone, "
+            f"{shared:10,.0f} reads/s with {writes:8,.0f} writes/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
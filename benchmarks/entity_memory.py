@@ -0,0 +1,72 @@
+"""Report the memory retained per student by the in-memory entity model.
+
+Student objects are compared with ``BaselineStudent``, the layout they had before
+slots, so the saving can be reproduced on any machine.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from institute import Student
+
+from .common import FIRST_NAMES, LAST_NAMES, build_institute
+
+
+def retained(action: Callable[[], object]) -> int:
+    """Return the bytes still allocated by ``action``'s result once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = action()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+@dataclass
+class BaselineStudent:
+    """The student layout before slots: a ``__dict__`` per object and a parent list."""
+
+    first_name: str
+    last_name: str
+    student_id: str
+    average_grade: float
+    _parents: list[Any] = field(default_factory=list, init=False, repr=False, compare=False)
+
+
+def make_students(count: int, factory: Callable[..., object] = Student) -> list[object]:
+    return [
+        factory(
+            FIRST_NAMES[number % len(FIRST_NAMES)],
+            LAST_NAMES[number % len(LAST_NAMES)],
+            f"S{number:07d}",
+            float(number % 100),
+        )
+        for number in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=200_000)
+    args = parser.parse_args()
+
+    count = args.students
+    baseline = retained(lambda: make_students(count, BaselineStudent))
+    objects = retained(lambda: make_students(count))
+    tree = retained(lambda: build_institute(count))
+    print(f"{count} students")
+    print(f"baseline layout: {baseline / count:7.1f} bytes per student")
+    print(f"Student objects: {objects / count:7.1f} bytes per student")
+    print(f"full institute:  {tree / count:7.1f} bytes per student")
+
+
+if __name__ == "__main__":
+    main()
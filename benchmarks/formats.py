@@ -0,0 +1,39 @@
+"""Compare file size, save time and load time of the JSON and binary formats."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from institute import DataManager
+
+from .common import build_institute, megabytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    institute = build_institute(args.students)
+    print(f"{args.students} students")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, name, options in (
+            ("json", "institute.json", {}),
+            ("json compact", "compact.json", {"indent": None}),
+            ("binary", "institute.bin", {}),
+        ):
+            path = Path(directory) / name
+            started = time.perf_counter()
+            DataManager.save(institute, path, **options)
+            saved = time.perf_counter() - started
+            started = time.perf_counter()
+            DataManager.load(path)
+            loaded = time.perf_counter() - started
+            size = megabytes(path.stat().st_size)
+            print(f"{label:>12}: size {size:>9}, save {saved:6.2f} s, load {loaded:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Compare startup cost of eager and lazy loading for a single student lookup."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from institute import DataManager
+
+from .common import build_institute, measure, megabytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "institute.bin"
+        DataManager.save(build_institute(args.students), path)
+        student_id = f"S{args.students // 2:07d}"
+        print(f"{args.students} students, looking up {student_id}")
+        for label, lazy in (("eager", False), ("lazy", True)):
+
+            def lookup() -> object:
+                institute = DataManager.load(path, lazy=lazy)
+                return institute.find_student_by_id(student_id)
+
+            result, elapsed, peak = measure(lookup)
+            assert result is not None
+            print(f"{label:>6}: {elapsed:6.2f} s, peak {megabytes(peak)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Compare peak memory of the regular and streaming JSON loaders."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from institute import DataManager
+
+from .common import build_institute, measure, megabytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "institute.json"
+        DataManager.save(build_institute(args.students), path)
+        print(f"{args.students} students, file size {megabytes(path.stat().st_size)}")
+        for label, streaming in (("json.loads", False), ("streaming", True)):
+            _, elapsed, peak = measure(lambda: DataManager.load(path, streaming=streaming))
+            print(f"{label:>10}: {elapsed:6.2f} s, peak {megabytes(peak)}")
+
+
+if __name__ == "__main__":
+    main()
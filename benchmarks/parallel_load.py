@@ -0,0 +1,41 @@
+"""Compare the serial JSON loader with the multi-process loader across worker counts."""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from institute import DataManager
+
+from .common import build_institute, megabytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "institute.json"
+        DataManager.save(build_institute(args.students), path, indent=None)
+        print(
+            f"{args.students} students, file size {megabytes(path.stat().st_size)}, "
+            f"{os.cpu_count()} CPU(s)"
+        )
+        started = time.perf_counter()
+        expected = DataManager.load(path).to_dict()
+        baseline = time.perf_counter() - started
+        print(f"    serial: {baseline:6.2f} s")
+        for workers in args.workers:
+            started = time.perf_counter()
+            institute = DataManager.load(path, workers=workers)
+            elapsed = time.perf_counter() - started
+            assert institute.to_dict() == expected
+            print(f"{workers:>2} worker(s): {elapsed:6.2f} s, speedup {baseline / elapsed:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare ``Institute.snapshot`` with a deep copy through ``to_dict``/``from_dict``.
+
+Each round changes a few grades and then takes a snapshot, keeping every
+snapshot alive, as a report generator holding older views would. The first
+snapshot's views stay cached in the institute after the snapshot is dropped;
+their size per student is reported as well.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from institute import Institute
+
+from .common import build_institute, megabytes, measure
+
+
+def rounds(institute: Institute, take: Callable[[], Any], count: int, edits: int) -> tuple[float, int]:
+    """Return the mean seconds per ``take`` and the bytes retained by all results."""
+    rng = random.Random(0)
+    student_ids = [path[-1].student_id for path in institute.find_students_by_name("")]
+    kept = []
+    elapsed = 0.0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(count):
+            for _ in range(edits):
+                path = institute.find_student_by_id(rng.choice(student_ids))
+                assert path is not None
+                path[-1].update_average_grade(round(rng.uniform(0.0, 100.0), 2))
+            started = time.perf_counter()
+            kept.append(take())
+            elapsed += time.perf_counter() - started
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed / count, retained
+
+
+def first_snapshot_bytes(institute: Institute) -> int:
+    """Return the bytes the institute keeps cached after its first snapshot is dropped."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        institute.snapshot()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=10, help="grade changes between snapshots")
+    args = parser.parse_args()
+
+    institute = build_institute(args.students)
+    cached = first_snapshot_bytes(build_institute(args.students))
+    _, first, peak = measure(institute.snapshot)
+    _, unchanged, _ = measure(institute.snapshot)
+    print(f"{args.students} students, {args.rounds} rounds of {args.edits} edits")
+    print(f"first snapshot:     {first * 1000:9.2f} ms, peak {megabytes(peak)}")
+    print(f"unchanged snapshot: {unchanged * 1e6:9.2f} us")
+    print(f"cached views:       {cached / args.students:9.1f} bytes per student")
+
+    snapshot_time, snapshot_bytes = rounds(institute, institute.snapshot, args.rounds, args.edits)
+    copy_time, copy_bytes = rounds(
+        institute, lambda: Institute.from_dict(institute.to_dict()), args.rounds, args.edits
+    )
+    for label, seconds, size in (("snapshot", snapshot_time, snapshot_bytes), ("deep copy", copy_time, copy_bytes)):
+        print(f"{label:<10} {seconds * 1000:9.2f} ms, {size / args.rounds / 1024:10.1f} KB retained per round")
+
+
+if __name__ == "__main__":
+    main()
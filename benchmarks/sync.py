@@ -0,0 +1,70 @@
+"""Compare syncing a replica with ``Institute.diff``/``apply_patch`` against
+shipping the whole institute as JSON, for growing numbers of edits."""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import time
+from typing import Iterator
+
+from institute import Institute, Student
+
+from .common import build_institute
+
+
+def edit(
+    institute: Institute, student_ids: list[str], count: int, rng: random.Random, serials: Iterator[int]
+) -> None:
+    """Make ``count`` edits: mostly grade changes, plus added, removed and moved students."""
+    for number in range(count):
+        path = institute.find_student_by_id(rng.choice(student_ids))
+        assert path is not None
+        if number % 10 == 9:
+            student_id = f"A{next(serials)}"
+            path[3].add_student(Student("Sync", "Added", student_id, 75.0))
+            student_ids.append(student_id)
+        elif number % 10 == 7:
+            # Moves the student to the end of its group.
+            path[3].remove_student(path[-1].student_id)
+            path[3].add_student(path[-1])
+        elif number % 10 == 8 and len(path[3].students) > 1:
+            path[3].remove_student(path[-1].student_id)
+            student_ids.remove(path[-1].student_id)
+        else:
+            path[-1].update_average_grade(round(rng.uniform(0.0, 100.0), 2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--edits", type=int, nargs="+", default=[10, 100, 1000, 10_000])
+    args = parser.parse_args()
+
+    primary = build_institute(args.students)
+    replica = Institute.from_dict(primary.to_dict())
+    student_ids = [path[-1].student_id for path in primary.find_students_by_name("")]
+    rng = random.Random(0)
+    serials = itertools.count()
+
+    started = time.perf_counter()
+    full = json.dumps(primary.to_dict())
+    Institute.from_dict(json.loads(full))
+    full_seconds = time.perf_counter() - started
+    print(f"{args.students} students; full JSON: {len(full) / 1024:10.1f} KB, {full_seconds * 1000:9.1f} ms")
+
+    base = primary.snapshot()
+    for count in args.edits:
+        edit(primary, student_ids, count, rng, serials)
+        started = time.perf_counter()
+        patch = json.dumps(primary.diff(base))
+        replica.apply_patch(json.loads(patch))
+        seconds = time.perf_counter() - started
+        base = primary.snapshot()
+        print(f"{count:>6} edits;   patch: {len(patch) / 1024:10.1f} KB, {seconds * 1000:9.1f} ms")
+    assert replica.to_dict() == primary.to_dict()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,10 @@
 """Institute domain model package."""
+import sys
+
+if sys.version_info < (3, 11):
+    raise ImportError("the institute package requires Python 3.11 or newer")
+
+from .bulk import BulkImportError
 from .course import Course
 from .data_manager import DataManager
 from .department import Department
@@ -9,6 +15,7 @@ from .student import Student
 from .university_entity import UniversityEntity
 
 __all__ = [
+    "BulkImportError",
     "Course",
     "DataManager",
     "Department",
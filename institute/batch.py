@@ -0,0 +1,165 @@
+"""Run structured institute operations from a file, without prompts.
+
+A batch file holds one JSON object per line; blank lines are skipped. Entities
+are addressed by ``Institute.resolve`` paths such as ``"3/Science/Mathematics"``,
+with ``""`` meaning the institute itself:
+
+    {"op": "add", "path": "3/Science/Mathematics", "data": {"name": "Group A"}}
+    {"op": "add", "path": "3/Science/Mathematics/Group A",
+     "data": {"first_name": "Ann", "last_name": "Lee", "student_id": "S1", "average_grade": 90}}
+    {"op": "remove", "path": "3/Science/Mathematics/Group A/S1"}
+    {"op": "grade", "path": "3/Science/Mathematics/Group A/S1", "grade": 95.5}
+    {"op": "rename", "path": "3/Science/Mathematics/Group A/S1", "first_name": "Anne", "last_name": "Lee"}
+    {"op": "search", "name": "ann"}  or  {"op": "search", "id": "S1"}
+    {"op": "save"}  or  {"op": "save", "path": "copy.json"}
+
+``add`` takes the ``to_dict`` form of the new child, so whole subtrees can be
+added at once. A search writes one JSON line listing the matching paths.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+from .course import Course
+from .department import Department
+from .faculty import Faculty
+from .group import Group
+from .institute import Institute, format_path
+from .student import Student
+
+Operation = dict[str, Any]
+
+# Entity type added below a parent reached by a path of this many parts, and the
+# field holding that entity's own children in its ``to_dict`` form.
+_CHILD_TYPES = (Course, Faculty, Department, Group, Student)
+_CHILD_FIELDS = ("faculties", "departments", "groups", "students", None)
+
+
+def _resolve(institute: Institute, operation: Operation) -> tuple[Any, ...]:
+    path = operation.get("path", "")
+    if not isinstance(path, str):
+        raise TypeError("path must be a string")
+    return institute.resolve(path) if path.strip() else ()
+
+
+def _student(institute: Institute, operation: Operation) -> Student:
+    nodes = _resolve(institute, operation)
+    if not nodes or not isinstance(nodes[-1], Student):
+        raise ValueError(f"{operation.get('path')!r} is not a student path")
+    return nodes[-1]
+
+
+def _check_shape(data: Any, level: int, where: str) -> None:
+    """Raise ``TypeError`` unless ``data`` and its nested children are objects in lists."""
+    if not isinstance(data, dict):
+        raise TypeError(f"{where} must be an object")
+    field = _CHILD_FIELDS[level]
+    if field is None or field not in data:
+        return
+    children = data[field]
+    if not isinstance(children, list):
+        raise TypeError(f"{where}.{field} must be a list")
+    for position, child in enumerate(children):
+        _check_shape(child, level + 1, f"{where}.{field}[{position}]")
+
+
+def _add(institute: Institute, operation: Operation) -> None:
+    nodes = _resolve(institute, operation)
+    if len(nodes) >= len(_CHILD_TYPES):
+        raise ValueError("cannot add below a student")
+    data = operation.get("data")
+    _check_shape(data, len(nodes), "data")
+    parent: Any = nodes[-1] if nodes else institute
+    parent._add_child(_CHILD_TYPES[len(nodes)].from_dict(data))
+
+
+def _remove(institute: Institute, operation: Operation) -> None:
+    nodes = _resolve(institute, operation)
+    if not nodes:
+        raise ValueError("path must name the entity to remove")
+    parent: Any = nodes[-2] if len(nodes) > 1 else institute
+    parent._remove_child(nodes[-1]._key)
+
+
+def _grade(institute: Institute, operation: Operation) -> None:
+    _student(institute, operation).update_average_grade(float(operation["grade"]))
+
+
+def _rename(institute: Institute, operation: Operation) -> None:
+    _student(institute, operation).rename(str(operation["first_name"]), str(operation["last_name"]))
+
+
+def _search(institute: Institute, operation: Operation) -> list[str]:
+    if "id" in operation:
+        found = institute.find_student_by_id(str(operation["id"]))
+        return [format_path(found)] if found else []
+    if "name" in operation:
+        return [format_path(path) for path in institute.find_students_by_name(str(operation["name"]))]
+    raise ValueError("search needs an 'id' or a 'name'")
+
+
+_HANDLERS: dict[str, Callable[[Institute, Operation], Optional[list[str]]]] = {
+    "add": _add,
+    "remove": _remove,
+    "grade": _grade,
+    "rename": _rename,
+    "search": _search,
+}
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    """Outcome of ``run_batch``."""
+
+    operations: int
+    failed: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Operations per second."""
+        return self.operations / self.seconds if self.seconds else 0.0
+
+
+def run_batch(
+    institute: Institute,
+    lines: Iterable[str],
+    save: Callable[[Optional[str]], object],
+    output: TextIO,
+    errors: TextIO,
+) -> BatchReport:
+    """Apply every operation in ``lines`` to ``institute``.
+
+    ``save(path)`` handles ``save`` operations, with ``None`` for the default
+    file. Search results go to ``output``; an operation that fails is reported
+    to ``errors`` with its line number and the batch carries on.
+    """
+    operations = failed = 0
+    started = time.perf_counter()
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        operations += 1
+        try:
+            operation = json.loads(line)
+            if not isinstance(operation, dict):
+                raise TypeError("operation must be a JSON object")
+            kind = operation.get("op")
+            if kind == "save":
+                path = operation.get("path")
+                save(None if path is None else str(path))
+                continue
+            handler = _HANDLERS.get(kind)  # type: ignore[arg-type]
+            if handler is None:
+                raise ValueError(f"unknown op {kind!r}; expected one of {(*_HANDLERS, 'save')}")
+            matches = handler(institute, operation)
+            if matches is not None:
+                output.write(json.dumps({"line": number, "matches": matches}, ensure_ascii=False) + "\n")
+        except (KeyError, TypeError, ValueError) as error:
+            failed += 1
+            message = f"missing field {error}" if isinstance(error, KeyError) else str(error)
+            errors.write(f"line {number}: {message}\n")
+    return BatchReport(operations, failed, time.perf_counter() - started)
@@ -0,0 +1,394 @@
+"""Compact binary snapshot format for institutes.
+
+Layout (all integers little-endian)::
+
+    header    MAGIC, version u16, reserved u16, string table offset u64,
+              directory offset u64 (version 2 and later)
+    institute name ref u32, course count u32
+    course    number u32, faculty count u32
+    faculty   name ref u32, department count u32
+    department name ref u32, group count u32
+    group     stats (version 3 only), name ref u32, student count u32,
+              payload size u64, payload
+    stats     grade total f64, minimum f64, maximum f64 (NaN when empty),
+              histogram u32[HISTOGRAM_BINS]
+    payload   grades f64[n], first name refs u32[n], last name refs u32[n],
+              ID offsets u32[n + 1], ID bytes (UTF-8)
+    strings   count u32, offsets u64[count + 1], UTF-8 bytes
+    directory group count u32, group payload offsets u64[groups], student count u64,
+              (group ordinal u32, student index u32)[students] sorted by ID bytes
+
+Names are stored once in the string table and referenced by index. Every group
+payload is length-prefixed so readers can skip it without decoding students, and
+the directory lets a memory-mapped reader find the group holding a student ID
+with a binary search. The stats give a lazily loaded group its grade statistics
+without touching the payload.
+"""
+from __future__ import annotations
+
+import math
+import mmap
+import struct
+import sys
+from array import array
+from functools import partial
+from typing import BinaryIO, Callable, Optional
+
+from .course import Course
+from .department import Department
+from .faculty import Faculty
+from .grade_stats import HISTOGRAM_BINS, GradeTotals
+from .group import Group
+from .institute import Institute
+from .student import Student
+
+MAGIC = b"\x89INST\r\n\x1a"
+VERSION = 3
+
+_HEADER_V1 = struct.Struct("<8sHHQ")
+_HEADER = struct.Struct("<8sHHQQ")
+_PAIR = struct.Struct("<II")
+_GROUP = struct.Struct("<IIQ")
+_STATS = struct.Struct(f"<ddd{HISTOGRAM_BINS}I")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_SWAP = sys.byteorder == "big"
+
+
+def _packed(typecode: str, values: object) -> bytes:
+    packed = array(typecode, values)  # type: ignore[arg-type]
+    if _SWAP:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpacked(typecode: str, data: bytes | memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def is_binary(prefix: bytes) -> bool:
+    """Return whether the first bytes of a file carry the binary snapshot magic."""
+    return prefix[: len(MAGIC)] == MAGIC
+
+
+class BinaryWriter:
+    """Write an institute to a seekable binary stream group by group."""
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        self._strings: dict[str, int] = {}
+        self._group_offsets: list[int] = []
+        self._directory: list[tuple[bytes, int, int]] = []
+
+    def _ref(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+        return index
+
+    def _write_group(self, group: Group) -> None:
+        students = group.students
+        grades = [student.average_grade for student in students]
+        totals = GradeTotals.of(grades)
+        nan = math.nan
+        self._handle.write(
+            _STATS.pack(
+                totals.total,
+                nan if totals.minimum is None else totals.minimum,
+                nan if totals.maximum is None else totals.maximum,
+                *totals.histogram,
+            )
+        )
+        ref = self._ref
+        id_bytes = [student.student_id.encode("utf-8") for student in students]
+        ordinal = len(self._group_offsets)
+        self._directory.extend((encoded, ordinal, index) for index, encoded in enumerate(id_bytes))
+        id_offsets = [0]
+        for encoded in id_bytes:
+            id_offsets.append(id_offsets[-1] + len(encoded))
+        payload = b"".join(
+            (
+                _packed("d", grades),
+                _packed("I", [ref(student.first_name) for student in students]),
+                _packed("I", [ref(student.last_name) for student in students]),
+                _packed("I", id_offsets),
+                b"".join(id_bytes),
+            )
+        )
+        self._handle.write(_GROUP.pack(ref(group.name), len(students), len(payload)))
+        self._group_offsets.append(self._handle.tell() - self._start)
+        self._handle.write(payload)
+
+    def write_institute(self, institute: Institute) -> None:
+        """Write the snapshot and patch the section offsets into the header."""
+        write = self._handle.write
+        start = self._start = self._handle.tell()
+        write(_HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+        write(_PAIR.pack(self._ref(institute.name), len(institute.courses)))
+        for course in institute.courses:
+            write(_PAIR.pack(course.number, len(course.faculties)))
+            for faculty in course.faculties:
+                write(_PAIR.pack(self._ref(faculty.name), len(faculty.departments)))
+                for department in faculty.departments:
+                    write(_PAIR.pack(self._ref(department.name), len(department.groups)))
+                    for group in department.groups:
+                        self._write_group(group)
+        table_offset = self._handle.tell() - start
+        encoded = [value.encode("utf-8") for value in self._strings]
+        offsets = [0]
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        write(_U32.pack(len(encoded)))
+        write(_packed("Q", offsets))
+        write(b"".join(encoded))
+        directory_offset = self._handle.tell() - start
+        write(_U32.pack(len(self._group_offsets)))
+        write(_packed("Q", self._group_offsets))
+        self._directory.sort()
+        write(_U64.pack(len(self._directory)))
+        entries = array("I")
+        for _, ordinal, index in self._directory:
+            entries.append(ordinal)
+            entries.append(index)
+        if _SWAP:
+            entries.byteswap()
+        write(entries.tobytes())
+        end = self._handle.tell()
+        self._handle.seek(start)
+        write(_HEADER.pack(MAGIC, VERSION, 0, table_offset, directory_offset))
+        self._handle.seek(end)
+
+
+class BinaryReader:
+    """Decode a binary snapshot held in a bytes-like buffer.
+
+    With ``validated`` the students are trusted to be valid, as when the buffer
+    was just encoded from live entities, and are built without checking them.
+    """
+
+    def __init__(self, data: bytes | memoryview | mmap.mmap, validated: bool = False) -> None:
+        self._data = memoryview(data)
+        self._make_student = Student._unchecked if validated else Student
+        magic, version, _, table_offset = _HEADER_V1.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a binary institute snapshot")
+        if version == 1:
+            self._body_offset = _HEADER_V1.size
+            self._directory_offset: Optional[int] = None
+        elif version in (2, VERSION):
+            self._body_offset = _HEADER.size
+            self._directory_offset = _HEADER.unpack_from(self._data, 0)[4]
+        else:
+            raise ValueError(f"Unsupported binary snapshot version {version}")
+        self._has_stats = version >= 3
+        (count,) = _U32.unpack_from(self._data, table_offset)
+        offsets_start = table_offset + _U32.size
+        blob_start = offsets_start + 8 * (count + 1)
+        self._string_offsets = _unpacked("Q", self._data[offsets_start:blob_start])
+        self._string_blob = blob_start
+        self._string_cache: list[str | None] = [None] * count
+
+    def string(self, index: int) -> str:
+        """Return the string table entry at ``index``, decoding it on first use."""
+        value = self._string_cache[index]
+        if value is None:
+            start = self._string_blob + self._string_offsets[index]
+            end = self._string_blob + self._string_offsets[index + 1]
+            value = self._string_cache[index] = str(self._data[start:end], "utf-8")
+        return value
+
+    def decode_grades(self, offset: int, count: int) -> array:
+        """Decode only the grades from the student payload of a group."""
+        return _unpacked("d", self._data[offset : offset + 8 * count])
+
+    def decode_students(self, offset: int, count: int) -> list[Student]:
+        """Decode the student payload of a group starting at ``offset``."""
+        data = self._data
+        grades = self.decode_grades(offset, count)
+        offset += 8 * count
+        first_names = _unpacked("I", data[offset : offset + 4 * count])
+        offset += 4 * count
+        last_names = _unpacked("I", data[offset : offset + 4 * count])
+        offset += 4 * count
+        id_offsets = _unpacked("I", data[offset : offset + 4 * (count + 1)])
+        offset += 4 * (count + 1)
+        raw_ids = bytes(data[offset : offset + id_offsets[-1]])
+        id_list = [str(raw_ids[id_offsets[i] : id_offsets[i + 1]], "utf-8") for i in range(count)]
+        string = self.string
+        make = self._make_student
+        return [make(string(first_names[i]), string(last_names[i]), id_list[i], grades[i]) for i in range(count)]
+
+    @property
+    def has_directory(self) -> bool:
+        return self._directory_offset is not None
+
+    def release(self) -> None:
+        """Drop the views into the underlying buffer so it can be closed."""
+        self._data.release()
+
+    def read_institute(
+        self, make_group: Optional[Callable[[str, int, int, Optional[GradeTotals]], Group]] = None
+    ) -> Institute:
+        """Build the institute described by the snapshot.
+
+        ``make_group(name, payload_offset, student_count, totals)`` may replace the
+        eager decoding of each group's students; ``totals`` holds the stored grade
+        statistics, or ``None`` for snapshots written before they were stored.
+        """
+        name, courses = self.read_courses(make_group)
+        return Institute(name, courses=courses)
+
+    def read_courses(
+        self, make_group: Optional[Callable[[str, int, int, Optional[GradeTotals]], Group]] = None
+    ) -> tuple[str, list[Course]]:
+        """Return the institute name and its courses without building the institute."""
+        data = self._data
+        string = self.string
+        offset = self._body_offset
+        name_ref, course_count = _PAIR.unpack_from(data, offset)
+        offset += _PAIR.size
+        courses = []
+        for _ in range(course_count):
+            number, faculty_count = _PAIR.unpack_from(data, offset)
+            offset += _PAIR.size
+            faculties = []
+            for _ in range(faculty_count):
+                faculty_ref, department_count = _PAIR.unpack_from(data, offset)
+                offset += _PAIR.size
+                departments = []
+                for _ in range(department_count):
+                    department_ref, group_count = _PAIR.unpack_from(data, offset)
+                    offset += _PAIR.size
+                    groups = []
+                    for _ in range(group_count):
+                        totals = None
+                        if self._has_stats:
+                            if make_group is not None:
+                                totals = self._totals_at(offset)
+                            offset += _STATS.size
+                        group_ref, student_count, size = _GROUP.unpack_from(data, offset)
+                        offset += _GROUP.size
+                        if make_group is None:
+                            students = self.decode_students(offset, student_count)
+                            groups.append(Group(string(group_ref), students=students))
+                        else:
+                            groups.append(make_group(string(group_ref), offset, student_count, totals))
+                        offset += size
+                    departments.append(Department(string(department_ref), groups=groups))
+                faculties.append(Faculty(string(faculty_ref), departments=departments))
+            courses.append(Course(number, faculties=faculties))
+        return string(name_ref), courses
+
+    def _totals_at(self, offset: int) -> GradeTotals:
+        total, minimum, maximum, *histogram = _STATS.unpack_from(self._data, offset)
+        (count,) = _U32.unpack_from(self._data, offset + _STATS.size + 4)
+        if not count:
+            return GradeTotals()
+        return GradeTotals.restore(count, total, minimum, maximum, histogram)
+
+    def _student_id_at(self, group_offset: int, index: int) -> bytes:
+        (count,) = _U32.unpack_from(self._data, group_offset - _GROUP.size + 4)
+        id_offsets_start = group_offset + 16 * count
+        start, end = struct.unpack_from("<II", self._data, id_offsets_start + 4 * index)
+        ids_start = id_offsets_start + 4 * (count + 1)
+        return bytes(self._data[ids_start + start : ids_start + end])
+
+    def locate(self, student_id: str) -> list[int]:
+        """Return the ordinals of the groups holding ``student_id``.
+
+        Binary-searches the sorted directory, touching O(log n) entries. Version 1
+        snapshots have no directory and raise ``LookupError``.
+        """
+        if self._directory_offset is None:
+            raise LookupError("Snapshot has no student directory")
+        data = self._data
+        offset = self._directory_offset
+        (group_count,) = _U32.unpack_from(data, offset)
+        group_offsets_start = offset + _U32.size
+        (entry_count,) = _U64.unpack_from(data, group_offsets_start + 8 * group_count)
+        entries_start = group_offsets_start + 8 * group_count + _U64.size
+        target = student_id.encode("utf-8")
+
+        def entry(position: int) -> tuple[int, bytes]:
+            ordinal, index = struct.unpack_from("<II", data, entries_start + 8 * position)
+            (group_offset,) = _U64.unpack_from(data, group_offsets_start + 8 * ordinal)
+            return ordinal, self._student_id_at(group_offset, index)
+
+        low, high = 0, entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if entry(middle)[1] < target:
+                low = middle + 1
+            else:
+                high = middle
+        ordinals = []
+        while low < entry_count:
+            ordinal, found = entry(low)
+            if found != target:
+                break
+            ordinals.append(ordinal)
+            low += 1
+        return ordinals
+
+
+class LazySnapshot:
+    """Memory-mapped snapshot whose groups decode their students on first access.
+
+    Only the course/faculty/department/group skeleton is read up front; student
+    lookups by ID go through the snapshot directory and decode just the groups
+    involved. The mapping is closed once every group has been decoded.
+    """
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._mapped: Optional[mmap.mmap] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._reader = BinaryReader(self._mapped)
+        self._groups: list[Group] = []
+        self._pending = 0
+        self._institute: Optional[Institute] = None
+
+    def build(self) -> Institute:
+        """Read the skeleton and return an institute made of deferred groups."""
+        institute = self._reader.read_institute(make_group=self._make_group)
+        self._institute = institute
+        if self._pending:
+            institute._student_locator = self._locate
+        else:
+            self._close()
+        return institute
+
+    def _make_group(self, name: str, offset: int, count: int, totals: Optional[GradeTotals]) -> Group:
+        if totals is None:
+            totals = GradeTotals.of(self._reader.decode_grades(offset, count))
+        group = Group._deferred(name, count, partial(self._decode, offset, count), totals)
+        self._groups.append(group)
+        self._pending += 1
+        return group
+
+    def _decode(self, offset: int, count: int) -> list[Student]:
+        students = self._reader.decode_students(offset, count)
+        self._pending -= 1
+        if not self._pending:
+            self._close()
+        return students
+
+    def _locate(self, student_id: Optional[str]) -> None:
+        if student_id is not None and self._reader.has_directory:
+            groups = [self._groups[ordinal] for ordinal in self._reader.locate(student_id)]
+        else:
+            groups = self._groups
+        for group in groups:
+            if group._loader is not None:
+                group._hydrate()
+
+    def _close(self) -> None:
+        if self._mapped is None:
+            return
+        if self._institute is not None:
+            self._institute._student_locator = None
+        self._reader.release()
+        self._mapped.close()
+        self._mapped = None
@@ -0,0 +1,102 @@
+"""Batch validation shared by the bulk import methods."""
+from __future__ import annotations
+
+from typing import Any, Container, Iterable, Sequence
+
+# Field order of the rows accepted by ``Institute.import_rows``.
+ROW_FIELDS = (
+    "course",
+    "faculty",
+    "department",
+    "group",
+    "first_name",
+    "last_name",
+    "student_id",
+    "average_grade",
+)
+
+ParsedRow = tuple[int, str, str, str, str, str, str, float]
+
+
+class BulkImportError(ValueError):
+    """Raised when a batch is rejected; ``errors`` lists every problem found.
+
+    Nothing from a rejected batch is applied.
+    """
+
+    def __init__(self, errors: Sequence[str]) -> None:
+        super().__init__(f"{len(errors)} problem(s) in batch:\n" + "\n".join(errors))
+        self.errors = list(errors)
+
+
+def duplicate_errors(keys: Sequence[Any], existing: Container[Any], label: str) -> list[str]:
+    """Report keys repeated within a batch or already present in ``existing``."""
+    errors: list[str] = []
+    seen: set[Any] = set()
+    for position, key in enumerate(keys):
+        if key in seen or key in existing:
+            errors.append(f"item {position}: duplicate {label} {key}")
+        seen.add(key)
+    return errors
+
+
+def _name(value: object, field: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{field} must be a non-empty string")
+    return value
+
+
+def _course(value: object) -> int:
+    """Return ``value`` as a course number, rejecting anything not integral."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    elif isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise ValueError("course must be an integer")
+
+
+def parse_rows(
+    rows: Iterable[Sequence[Any]],
+) -> tuple[list[tuple[int, ParsedRow]], list[tuple[int, str]]]:
+    """Check and normalise import rows in one pass.
+
+    Returns ``(row number, parsed row)`` pairs for the valid rows and a
+    ``(row number, message)`` pair for every invalid one. Entity names are
+    stripped like ``UniversityEntity`` does.
+    """
+    parsed: list[tuple[int, ParsedRow]] = []
+    errors: list[tuple[int, str]] = []
+    for number, row in enumerate(rows):
+        try:
+            parsed.append((number, parse_row(row)))
+        except (TypeError, ValueError) as error:
+            errors.append((number, str(error)))
+    return parsed, errors
+
+
+def parse_row(row: Sequence[Any]) -> ParsedRow:
+    """Check and normalise one import row, raising ``ValueError`` if it is invalid."""
+    if len(row) != len(ROW_FIELDS):
+        raise ValueError(f"expected {len(ROW_FIELDS)} fields, got {len(row)}")
+    course, faculty, department, group, first_name, last_name, student_id, grade = row
+    course = _course(course)
+    if not 1 <= course <= 6:
+        raise ValueError("course must be between 1 and 6")
+    grade = float(grade)
+    if not 0.0 <= grade <= 100.0:
+        raise ValueError("average_grade must be between 0 and 100")
+    return (
+        course,
+        _name(faculty, "faculty").strip(),
+        _name(department, "department").strip(),
+        _name(group, "group").strip(),
+        _name(first_name, "first_name"),
+        _name(last_name, "last_name"),
+        _name(student_id, "student_id"),
+        grade,
+    )
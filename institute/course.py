@@ -1,15 +1,18 @@
 """Course entity definition."""
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, Optional
 
 from .faculty import Faculty
-from .university_entity import UniversityEntity
+from .keyed_collection import KeyedCollection
+from .university_entity import References, UniversityEntity
 
 
 class Course(UniversityEntity):
     """Represent a course year within the institute."""
 
+    __slots__ = ("_number", "_faculties")
+
     def __init__(self, number: int, faculties: Iterable[Faculty] | None = None) -> None:
         if not isinstance(number, int):
             raise TypeError("number must be an integer")
@@ -17,7 +20,7 @@ class Course(UniversityEntity):
             raise ValueError("number must be between 1 and 6")
         super().__init__(f"Course {number}")
         self._number = number
-        self._faculties: List[Faculty] = []
+        self._faculties: KeyedCollection[str, Faculty] = KeyedCollection()
         if faculties:
             for faculty in faculties:
                 self.add_faculty(faculty)
@@ -26,42 +29,61 @@ class Course(UniversityEntity):
     def number(self) -> int:
         return self._number
 
+    @property
+    def _key(self) -> int:
+        return self._number
+
     @property
     def faculties(self) -> tuple[Faculty, ...]:
-        return tuple(self._faculties)
+        return self._faculties.snapshot()
 
     def add_faculty(self, faculty: Faculty) -> None:
         if not isinstance(faculty, Faculty):
             raise TypeError("faculty must be an instance of Faculty")
-        if any(existing.name == faculty.name for existing in self._faculties):
+        if faculty.name in self._faculties:
             raise ValueError(
                 f"Faculty with name {faculty.name} already exists in course {self._number}"
             )
-        self._faculties.append(faculty)
+        self._faculties.add(faculty.name, faculty)
+        faculty._attach_to(self)
+        self._propagate("attach", (faculty,))
 
     def remove_faculty(self, name: str) -> Faculty:
-        for index, faculty in enumerate(self._faculties):
-            if faculty.name == name:
-                return self._faculties.pop(index)
-        raise ValueError(f"Faculty with name {name} not found in course {self._number}")
+        try:
+            faculty = self._faculties.pop(name)
+        except KeyError:
+            raise ValueError(f"Faculty with name {name} not found in course {self._number}") from None
+        faculty._detach_from(self)
+        self._propagate("detach", (faculty,))
+        return faculty
 
     def find_faculty(self, name: str) -> Optional[Faculty]:
         """Return a faculty by name if present."""
-        return next((faculty for faculty in self._faculties if faculty.name == name), None)
+        return self._faculties.get(name)
+
+    def _child_collection(self) -> KeyedCollection[str, Faculty]:
+        return self._faculties
+
+    _add_child = add_faculty
+    _remove_child = remove_faculty
+
+    def _children(self) -> tuple[Faculty, ...]:
+        return self._faculties.snapshot()
 
     def __str__(self) -> str:
         return f"Course {self._number} with {len(self._faculties)} faculties"
 
-    def to_dict(self) -> dict[str, object]:
+    def to_dict(self, refs: Optional[References] = None) -> dict[str, object]:
         """Serialize the course to a JSON-compatible dictionary."""
         return {
             "number": self._number,
-            "faculties": [faculty.to_dict() for faculty in self._faculties],
+            "faculties": [faculty._dump(refs) for faculty in self._faculties],
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, object]) -> "Course":
+    def from_dict(cls, data: dict[str, object], refs: Optional[dict[str, Any]] = None) -> "Course":
         """Create a course from a serialized dictionary."""
+        refs = {} if refs is None else refs
         faculties_data = data.get("faculties", [])
-        faculties = [Faculty.from_dict(faculty_data) for faculty_data in faculties_data]
+        faculties = [Faculty._load(faculty_data, refs) for faculty_data in faculties_data]
         return cls(number=int(data["number"]), faculties=faculties)
@@ -0,0 +1,122 @@
+"""Streaming CSV ingest and export, one row per student.
+
+Columns are those of ``bulk.ROW_FIELDS``. The reader applies rows as they are
+read and the writer emits them during a single traversal, so memory follows the
+size of the tree rather than the size of the file. CSV has no notion of shared
+subtrees: a student reachable through several routes is written once per route
+and read back into separate containers.
+"""
+from __future__ import annotations
+
+import csv
+from typing import Any, Iterator, TextIO
+
+from .bulk import ROW_FIELDS, parse_row
+from .course import Course
+from .department import Department
+from .faculty import Faculty
+from .group import Group
+from .institute import Institute
+from .student import Student
+
+# Entity created for a missing container at each depth below the institute.
+_FACTORIES = (Course, Faculty, Department, Group)
+
+
+class _PathCache:
+    """Resolve ``(course, faculty, department, group)`` keys to groups, creating
+    missing containers, with every resolved prefix remembered."""
+
+    def __init__(self, institute: Institute) -> None:
+        self._institute = institute
+        self._nodes: dict[tuple[Any, ...], Any] = {}
+
+    def group(self, key: tuple[int, str, str, str]) -> Group:
+        node = self._nodes.get(key)
+        if node is not None:
+            return node
+        depth = len(key) - 1
+        while depth and key[:depth] not in self._nodes:
+            depth -= 1
+        node = self._nodes[key[:depth]] if depth else self._institute
+        for depth in range(depth, len(key)):
+            child = node._child_collection().get(key[depth])
+            if child is None:
+                child = _FACTORIES[depth](key[depth])
+                node._add_child(child)
+            node = self._nodes[key[: depth + 1]] = child
+        return node
+
+
+def read_csv(handle: TextIO, institute: Institute) -> int:
+    """Apply the student rows of a CSV stream to ``institute``.
+
+    The header names the columns, in any order. Missing containers are created;
+    a row for a student ID already present in its group updates that student's
+    name and grade. Rows are applied as they are read, so an invalid row raises
+    ``ValueError`` naming its line and leaves the earlier rows applied. Returns
+    the number of rows read.
+    """
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return 0
+    columns = [name.strip() for name in header]
+    missing = [name for name in ROW_FIELDS if name not in columns]
+    if missing:
+        raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+    order = [columns.index(name) for name in ROW_FIELDS]
+    cache = _PathCache(institute)
+    count = 0
+    for record in reader:
+        if not record:
+            continue
+        try:
+            if len(record) != len(columns):
+                raise ValueError(f"expected {len(columns)} fields, got {len(record)}")
+            row = parse_row([record[index] for index in order])
+            group = cache.group(row[:4])
+            _, _, _, _, first_name, last_name, student_id, grade = row
+            student = group.find_student_by_id(student_id)
+            if student is None:
+                group.add_student(Student._unchecked(first_name, last_name, student_id, grade))
+            else:
+                if (student.first_name, student.last_name) != (first_name, last_name):
+                    student.rename(first_name, last_name)
+                if student.average_grade != grade:
+                    student.update_average_grade(grade)
+        except ValueError as error:
+            raise ValueError(f"CSV line {reader.line_num}: {error}") from None
+        count += 1
+    return count
+
+
+def iter_rows(institute: Institute) -> Iterator[tuple[Any, ...]]:
+    """Yield one row per student path in traversal order."""
+    for course in institute.courses:
+        for faculty in course.faculties:
+            for department in faculty.departments:
+                for group in department.groups:
+                    for student in group.students:
+                        yield (
+                            course.number,
+                            faculty.name,
+                            department.name,
+                            group.name,
+                            student.first_name,
+                            student.last_name,
+                            student.student_id,
+                            student.average_grade,
+                        )
+
+
+def write_csv(institute: Institute, handle: TextIO, header: bool = True) -> int:
+    """Write every student of ``institute`` as a CSV row; return the number of rows."""
+    writer = csv.writer(handle)
+    if header:
+        writer.writerow(ROW_FIELDS)
+    count = 0
+    for row in iter_rows(institute):
+        writer.writerow(row)
+        count += 1
+    return count
@@ -1,30 +1,328 @@
 """Persistence helpers for the institute domain model."""
 from __future__ import annotations
 
+import asyncio
+import gc
 import json
+import os
+import struct
+import tempfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterator, Optional
 
+from .binary_format import MAGIC, BinaryReader, BinaryWriter, LazySnapshot, is_binary
+from .csv_stream import read_csv, write_csv
+from .frozen import FrozenInstitute
 from .institute import Institute
+from .json_stream import JsonStreamWriter, read_institute
+from .parallel_load import load_parallel
+
+DEFAULT_DATA_FILE = Path("institute_data.json")
+WRITE_BUFFER_SIZE = 1 << 20
+BINARY_SUFFIX = ".bin"
+CHANGES_SUFFIX = ".changes"
+STAMP_WINDOW = 1 << 16
+FORMATS = ("json", "binary")
+
+# One thread, so background saves finish in the order they were requested.
+_save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="institute-save")
+
+
+def changes_path(path: Path) -> Path:
+    """Return the change log that accompanies the snapshot at ``path``."""
+    return path.with_name(path.name + CHANGES_SUFFIX)
+
+
+def _snapshot_stamp(path: Path) -> dict[str, int]:
+    """Identify a snapshot by its size and a checksum of its tail."""
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(max(0, size - STAMP_WINDOW))
+        return {"size": size, "crc32": zlib.crc32(handle.read())}
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend the cyclic garbage collector while a large object graph is built.
+
+    Loading allocates millions of long-lived objects and no garbage cycles, so
+    collections triggered along the way only rescan the growing graph.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "w", newline: Optional[str] = None) -> Iterator[IO[Any]]:
+    """Write to a temporary sibling of ``path`` and atomically replace it on success.
+
+    The data is flushed and fsynced before the rename, so a crash leaves either the
+    previous file or the complete new one.
+    """
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with open(fd, mode, buffering=WRITE_BUFFER_SIZE, encoding=encoding, newline=newline) as handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temp_name, path.stat().st_mode if path.exists() else 0o644)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    if os.name == "posix":
+        directory_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
 
 
 class DataManager:
     """Handle saving and loading institute data."""
 
     @staticmethod
-    def save(institute: Institute, file_path: str | Path) -> None:
-        """Persist the institute to the provided JSON file."""
+    def save(
+        institute: Institute | FrozenInstitute,
+        file_path: str | Path,
+        indent: Optional[int] = 2,
+        file_format: Optional[str] = None,
+        references: bool = False,
+    ) -> None:
+        """Persist the institute to the provided file.
+
+        The document is streamed group by group into a temporary file that replaces
+        the target atomically. Pass ``indent=None`` for compact JSON output.
+        ``file_format`` is ``"json"`` or ``"binary"``; by default files ending in
+        ``.bin`` use the binary snapshot format and everything else JSON.
+
+        By default an entity held by several parents is written in full at each
+        place, which any reader of the plain format can load. With ``references``
+        a JSON document writes it once and refers to it from its other places
+        (see ``Institute.to_dict``), so loading restores the sharing. The binary
+        format always writes full copies.
+        """
+        path = Path(file_path)
+        if file_format is None:
+            file_format = "binary" if path.suffix == BINARY_SUFFIX else "json"
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown file format {file_format!r}; expected one of {FORMATS}")
+        if file_format == "binary":
+            with atomic_write(path, "wb") as handle:
+                BinaryWriter(handle).write_institute(institute)
+        else:
+            with atomic_write(path) as handle:
+                JsonStreamWriter(handle, indent, references).write_institute(institute)
+        # The log described the previous snapshot; its stamp no longer matches anyway.
+        changes_path(path).unlink(missing_ok=True)
+
+    @staticmethod
+    def save_background(
+        institute: Institute,
+        file_path: str | Path,
+        indent: Optional[int] = 2,
+        file_format: Optional[str] = None,
+        references: bool = False,
+    ) -> Future[None]:
+        """Freeze the institute now and ``save`` the copy in a background thread.
+
+        Only the copy (see ``Institute.snapshot``) is made on the calling thread, so the
+        institute can be changed again straight away; the file holds its state at
+        the time of the call. The returned future reports completion or the error.
+        Background saves run one at a time in the order they were started.
+        """
+        with institute.reading():
+            frozen = institute.snapshot()
+        return _save_executor.submit(DataManager.save, frozen, file_path, indent, file_format, references)
+
+    @staticmethod
+    async def save_async(
+        institute: Institute,
+        file_path: str | Path,
+        indent: Optional[int] = 2,
+        file_format: Optional[str] = None,
+        references: bool = False,
+    ) -> None:
+        """Awaitable ``save_background`` for asyncio code."""
+        await asyncio.wrap_future(
+            DataManager.save_background(institute, file_path, indent, file_format, references)
+        )
+
+    @staticmethod
+    async def load_async(
+        file_path: str | Path,
+        streaming: bool = False,
+        lazy: bool = False,
+        workers: Optional[int] = None,
+    ) -> Institute:
+        """Run ``load`` in a worker thread and return the institute it builds."""
+        return await asyncio.to_thread(DataManager.load, file_path, streaming, lazy, workers)
+
+    @staticmethod
+    def export_csv(institute: Institute, file_path: str | Path) -> int:
+        """Stream every student to a CSV file, one row per student; return the row count.
+
+        The file is replaced atomically like a snapshot.
+        """
+        with atomic_write(Path(file_path), newline="") as handle:
+            return write_csv(institute, handle)
+
+    @staticmethod
+    def import_csv(file_path: str | Path, institute: Optional[Institute] = None) -> Institute:
+        """Build an institute from a CSV file, or add the file's rows to ``institute``.
+
+        Rows are read and applied one at a time, creating missing courses,
+        faculties, departments and groups; a row for a student already in its group
+        updates that student. A new institute is named after the file.
+        """
+        path = Path(file_path)
+        if institute is None:
+            institute = Institute(path.stem)
+        with path.open(encoding="utf-8", newline="") as handle:
+            read_csv(handle, institute)
+        return institute
+
+    @staticmethod
+    def save_incremental(
+        institute: Institute, file_path: str | Path, file_format: Optional[str] = None
+    ) -> int:
+        """Append the changes made since the last incremental save to the change log.
+
+        Only subtrees marked dirty are written, as JSON lines in ``<file>.changes``
+        next to the snapshot, so the cost follows the number of edits rather than the
+        size of the institute. Without an existing snapshot a full save is done
+        instead. ``load`` replays the log and ``compact`` folds it into the snapshot.
+        Returns the number of change records written.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            DataManager.save(institute, path, file_format=file_format)
+            institute._clear_dirty()
+            return 0
+        changes, cleared = institute._collect_changes()
+        if changes:
+            log_path = changes_path(path)
+            header = None if log_path.exists() else DataManager._log_header(path)
+            with log_path.open("a", encoding="utf-8") as handle:
+                if header is not None:
+                    handle.write(json.dumps(header) + "\n")
+                for change in changes:
+                    handle.write(json.dumps(change, ensure_ascii=False, separators=(",", ":")) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        for entity, whole_subtree in cleared:
+            if whole_subtree:
+                entity._clear_dirty()
+            else:
+                entity._dirty.clear()
+        return len(changes)
+
+    @staticmethod
+    def compact(file_path: str | Path) -> None:
+        """Fold the change log into a new snapshot in the same format and drop the log."""
+        path = Path(file_path)
+        DataManager.save(DataManager.load(path), path, file_format=DataManager.detect_format(path))
+
+    @staticmethod
+    def detect_format(file_path: str | Path) -> str:
+        """Return the format of an existing snapshot, or the one its name implies."""
         path = Path(file_path)
-        if not path.parent.exists():
-            path.parent.mkdir(parents=True, exist_ok=True)
-        data = institute.to_dict()
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+        if path.exists():
+            with path.open("rb") as handle:
+                return "binary" if is_binary(handle.read(len(MAGIC))) else "json"
+        return "binary" if path.suffix == BINARY_SUFFIX else "json"
 
     @staticmethod
-    def load(file_path: str | Path) -> Institute:
-        """Load institute data from the provided JSON file."""
+    def load(
+        file_path: str | Path,
+        streaming: bool = False,
+        lazy: bool = False,
+        workers: Optional[int] = None,
+    ) -> Institute:
+        """Load institute data from the provided JSON or binary snapshot file.
+
+        The format is detected from the file header. With ``streaming`` a JSON file
+        is parsed incrementally and entities are built as each subtree completes, so
+        neither the raw text nor the full dictionary tree is held in memory.
+
+        With ``lazy`` a binary snapshot is memory-mapped and only its course,
+        faculty, department and group skeleton is read; each group decodes its
+        students on first access. JSON files are always loaded eagerly.
+
+        With ``workers`` a JSON file is split at faculty boundaries and the
+        faculties are parsed and validated by that many processes (see
+        ``parallel_load``). Binary snapshots need no parsing and are always decoded
+        in this process.
+
+        Changes appended by ``save_incremental`` are replayed on top of the snapshot.
+        """
         path = Path(file_path)
-        content = path.read_text()
+        with gc_paused():
+            institute = DataManager._load(path, streaming, lazy, workers)
+            DataManager._replay_log(institute, changes_path(path), path)
+        institute._clear_dirty()
+        return institute
+
+    @staticmethod
+    def _log_header(snapshot_path: Path) -> dict[str, Any]:
+        return {"op": "base", **_snapshot_stamp(snapshot_path)}
+
+    @staticmethod
+    def _replay_log(institute: Institute, log_path: Path, snapshot_path: Path) -> int:
+        """Apply the change records of a log based on ``snapshot_path``; return their count."""
+        if not log_path.exists() or not snapshot_path.exists():
+            return 0
+        applied = 0
+        with log_path.open(encoding="utf-8") as handle:
+            lines = iter(handle)
+            try:
+                header = json.loads(next(lines, "null"))
+            except json.JSONDecodeError:
+                return 0
+            if header != DataManager._log_header(snapshot_path):
+                return 0  # Left over from before the snapshot was last rewritten.
+            for line in lines:
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    if line.endswith("\n"):
+                        raise
+                    break  # Torn final record from an interrupted append.
+                institute._apply_change(change)
+                applied += 1
+        return applied
+
+    @staticmethod
+    def _load(path: Path, streaming: bool, lazy: bool, workers: Optional[int]) -> Institute:
+        with path.open("rb") as handle:
+            prefix = handle.read(len(MAGIC))
+            if is_binary(prefix):
+                try:
+                    if lazy:
+                        return LazySnapshot(handle).build()
+                    return BinaryReader(prefix + handle.read()).read_institute()
+                except (struct.error, IndexError) as exc:
+                    raise ValueError(f"Corrupt binary snapshot: {exc}") from exc
+        if workers is not None:
+            return load_parallel(path, workers)
+        if streaming:
+            with path.open(encoding="utf-8") as handle:
+                return read_institute(handle)
+        content = path.read_text(encoding="utf-8")
         raw_data: Any = json.loads(content)
         if not isinstance(raw_data, dict):
             raise ValueError("Serialized institute data must be a JSON object")
@@ -1,56 +1,96 @@
 """Department entity definition."""
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, Optional
 
+from .bulk import BulkImportError, duplicate_errors
 from .group import Group
-from .university_entity import UniversityEntity
+from .keyed_collection import KeyedCollection
+from .university_entity import References, UniversityEntity
 
 
 class Department(UniversityEntity):
     """Represent an academic department."""
 
+    __slots__ = ("_groups",)
+
     def __init__(self, name: str, groups: Iterable[Group] | None = None) -> None:
         super().__init__(name)
-        self._groups: List[Group] = []
+        self._groups: KeyedCollection[str, Group] = KeyedCollection()
         if groups:
             for group in groups:
                 self.add_group(group)
 
     @property
     def groups(self) -> tuple[Group, ...]:
-        return tuple(self._groups)
+        return self._groups.snapshot()
 
     def add_group(self, group: Group) -> None:
         if not isinstance(group, Group):
             raise TypeError("group must be an instance of Group")
-        if any(existing.name == group.name for existing in self._groups):
+        if group.name in self._groups:
             raise ValueError(f"Group with name {group.name} already exists in department {self.name}")
-        self._groups.append(group)
+        self._groups.add(group.name, group)
+        group._attach_to(self)
+        self._propagate("attach", (group,))
+
+    def add_groups_bulk(self, groups: Iterable[Group]) -> None:
+        """Add a batch of groups, or none of them if any is rejected.
+
+        Every problem in the batch is reported together in a ``BulkImportError``.
+        """
+        batch = list(groups)
+        errors = [
+            f"item {position}: group must be an instance of Group"
+            for position, group in enumerate(batch)
+            if not isinstance(group, Group)
+        ]
+        if not errors:
+            names = [group.name for group in batch]
+            errors = duplicate_errors(names, self._groups, f"group name in department {self.name}:")
+        if errors:
+            raise BulkImportError(errors)
+        for group in batch:
+            self._groups.add(group.name, group)
+            group._attach_to(self)
+            self._propagate("attach", (group,))
 
     def remove_group(self, name: str) -> Group:
-        for index, group in enumerate(self._groups):
-            if group.name == name:
-                return self._groups.pop(index)
-        raise ValueError(f"Group with name {name} not found in department {self.name}")
+        try:
+            group = self._groups.pop(name)
+        except KeyError:
+            raise ValueError(f"Group with name {name} not found in department {self.name}") from None
+        group._detach_from(self)
+        self._propagate("detach", (group,))
+        return group
 
     def find_group(self, name: str) -> Optional[Group]:
         """Return a group by name if present."""
-        return next((group for group in self._groups if group.name == name), None)
+        return self._groups.get(name)
+
+    def _child_collection(self) -> KeyedCollection[str, Group]:
+        return self._groups
+
+    _add_child = add_group
+    _remove_child = remove_group
+
+    def _children(self) -> tuple[Group, ...]:
+        return self._groups.snapshot()
 
     def __str__(self) -> str:
         return f"Department {self.name} with {len(self._groups)} groups"
 
-    def to_dict(self) -> dict[str, object]:
+    def to_dict(self, refs: Optional[References] = None) -> dict[str, object]:
         """Serialize the department to a JSON-compatible dictionary."""
         return {
             "name": self.name,
-            "groups": [group.to_dict() for group in self._groups],
+            "groups": [group._dump(refs) for group in self._groups],
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, object]) -> "Department":
+    def from_dict(cls, data: dict[str, object], refs: Optional[dict[str, Any]] = None) -> "Department":
         """Create a department from a serialized dictionary."""
+        refs = {} if refs is None else refs
         groups_data = data.get("groups", [])
-        groups = [Group.from_dict(group_data) for group_data in groups_data]
+        groups = [Group._load(group_data, refs) for group_data in groups_data]
         return cls(name=str(data["name"]), groups=groups)
@@ -1,58 +1,76 @@
 """Faculty entity definition."""
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, Optional
 
 from .department import Department
-from .university_entity import UniversityEntity
+from .keyed_collection import KeyedCollection
+from .university_entity import References, UniversityEntity
 
 
 class Faculty(UniversityEntity):
     """Represent a faculty."""
 
+    __slots__ = ("_departments",)
+
     def __init__(self, name: str, departments: Iterable[Department] | None = None) -> None:
         super().__init__(name)
-        self._departments: List[Department] = []
+        self._departments: KeyedCollection[str, Department] = KeyedCollection()
         if departments:
             for department in departments:
                 self.add_department(department)
 
     @property
     def departments(self) -> tuple[Department, ...]:
-        return tuple(self._departments)
+        return self._departments.snapshot()
 
     def add_department(self, department: Department) -> None:
         if not isinstance(department, Department):
             raise TypeError("department must be an instance of Department")
-        if any(existing.name == department.name for existing in self._departments):
+        if department.name in self._departments:
             raise ValueError(
                 f"Department with name {department.name} already exists in faculty {self.name}"
             )
-        self._departments.append(department)
+        self._departments.add(department.name, department)
+        department._attach_to(self)
+        self._propagate("attach", (department,))
 
     def remove_department(self, name: str) -> Department:
-        for index, department in enumerate(self._departments):
-            if department.name == name:
-                return self._departments.pop(index)
-        raise ValueError(f"Department with name {name} not found in faculty {self.name}")
+        try:
+            department = self._departments.pop(name)
+        except KeyError:
+            raise ValueError(f"Department with name {name} not found in faculty {self.name}") from None
+        department._detach_from(self)
+        self._propagate("detach", (department,))
+        return department
 
     def find_department(self, name: str) -> Optional[Department]:
         """Return a department by name if present."""
-        return next((department for department in self._departments if department.name == name), None)
+        return self._departments.get(name)
+
+    def _child_collection(self) -> KeyedCollection[str, Department]:
+        return self._departments
+
+    _add_child = add_department
+    _remove_child = remove_department
+
+    def _children(self) -> tuple[Department, ...]:
+        return self._departments.snapshot()
 
     def __str__(self) -> str:
         return f"Faculty {self.name} with {len(self._departments)} departments"
 
-    def to_dict(self) -> dict[str, object]:
+    def to_dict(self, refs: Optional[References] = None) -> dict[str, object]:
         """Serialize the faculty to a JSON-compatible dictionary."""
         return {
             "name": self.name,
-            "departments": [department.to_dict() for department in self._departments],
+            "departments": [department._dump(refs) for department in self._departments],
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, object]) -> "Faculty":
+    def from_dict(cls, data: dict[str, object], refs: Optional[dict[str, Any]] = None) -> "Faculty":
         """Create a faculty from a serialized dictionary."""
+        refs = {} if refs is None else refs
         departments_data = data.get("departments", [])
-        departments = [Department.from_dict(dept_data) for dept_data in departments_data]
+        departments = [Department._load(dept_data, refs) for dept_data in departments_data]
         return cls(name=str(data["name"]), departments=departments)
@@ -0,0 +1,195 @@
+"""Read-only views of an institute that later changes do not affect.
+
+``Institute.snapshot`` hands these out for reports and background saves. Each
+live entity keeps the view it was last frozen as; a change marks the views
+along its path up to the institute as stale, so the next snapshot copies just
+those entities and shares every untouched subtree with earlier snapshots.
+Students have no view slot: a rebuilt group takes the views of its unchanged
+students from its previous view. The views expose the attributes the JSON and
+binary writers read, and a node with several parents has a single view that
+keeps its parent count, so ``$id``/``$ref`` output still sees the sharing.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .student import Student
+
+if TYPE_CHECKING:
+    from .course import Course
+    from .department import Department
+    from .faculty import Faculty
+    from .group import Group
+    from .institute import Institute
+
+
+class FrozenStudent:
+    """The fields of a student at the moment it was frozen."""
+
+    __slots__ = ("first_name", "last_name", "student_id", "average_grade", "_parents")
+
+    def __init__(self, student: Student) -> None:
+        self.first_name = student.first_name
+        self.last_name = student.last_name
+        self.student_id = student.student_id
+        self.average_grade = student.average_grade
+        self._parents = student._parents
+
+    @property
+    def _key(self) -> str:
+        return self.student_id
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    def _matches(self, student: Student) -> bool:
+        """Return whether ``student`` still has the fields and parents of this view."""
+        return (
+            self._parents is student._parents
+            and self.average_grade == student.average_grade
+            and self.first_name == student.first_name
+            and self.last_name == student.last_name
+        )
+
+    to_dict = Student.to_dict
+
+
+class FrozenEntity:
+    """A named container and its frozen children."""
+
+    __slots__ = ("name", "_children", "_parents")
+
+    # Key of the children in the ``to_dict`` form of the live entity.
+    _CHILDREN_FIELD = ""
+
+    def __init__(self, name: str, children: tuple[Any, ...], parents: tuple[Any, ...]) -> None:
+        self.name = name
+        self._children = children
+        self._parents = parents
+
+    @property
+    def _key(self) -> object:
+        return self.name
+
+    def to_dict(self) -> dict[str, object]:
+        """Serialize like the live entity's ``to_dict``, with shared children in full."""
+        return {"name": self.name, self._CHILDREN_FIELD: [child.to_dict() for child in self._children]}
+
+
+class FrozenGroup(FrozenEntity):
+    __slots__ = ()
+    _CHILDREN_FIELD = "students"
+
+    @property
+    def students(self) -> tuple[FrozenStudent, ...]:
+        return self._children
+
+
+class FrozenDepartment(FrozenEntity):
+    __slots__ = ()
+    _CHILDREN_FIELD = "groups"
+
+    @property
+    def groups(self) -> tuple[FrozenGroup, ...]:
+        return self._children
+
+
+class FrozenFaculty(FrozenEntity):
+    __slots__ = ()
+    _CHILDREN_FIELD = "departments"
+
+    @property
+    def departments(self) -> tuple[FrozenDepartment, ...]:
+        return self._children
+
+
+class FrozenCourse(FrozenEntity):
+    __slots__ = ("number",)
+
+    def __init__(self, number: int, children: tuple[Any, ...], parents: tuple[Any, ...]) -> None:
+        super().__init__(f"Course {number}", children, parents)
+        self.number = number
+
+    @property
+    def _key(self) -> int:
+        return self.number
+
+    def to_dict(self) -> dict[str, object]:
+        return {"number": self.number, "faculties": [child.to_dict() for child in self._children]}
+
+    @property
+    def faculties(self) -> tuple[FrozenFaculty, ...]:
+        return self._children
+
+
+class FrozenInstitute(FrozenEntity):
+    __slots__ = ()
+    _CHILDREN_FIELD = "courses"
+
+    @property
+    def courses(self) -> tuple[FrozenCourse, ...]:
+        return self._children
+
+
+# Views of students with several groups made so far by one ``freeze``, by ``id``.
+_Shared = dict[int, FrozenStudent]
+
+
+def _view(node: Any, build: Callable[[Any, _Shared], Any], shared: _Shared) -> Any:
+    view = node._frozen
+    # A node attached to or detached from another parent gets a new parent count.
+    if node._stale or view._parents is not node._parents:
+        view = node._frozen = build(node, shared)
+        node._stale = False
+    return view
+
+
+def _student(student: Student, previous: Optional[FrozenStudent], shared: _Shared) -> FrozenStudent:
+    if len(student._parents) < 2:
+        return previous if previous is not None and previous._matches(student) else FrozenStudent(student)
+    # Every group holding a shared student must hand out the same view.
+    view = shared.get(id(student))
+    if view is None:
+        view = previous if previous is not None and previous._matches(student) else FrozenStudent(student)
+        shared[id(student)] = view
+    return view
+
+
+def _group(node: Group, shared: _Shared) -> FrozenGroup:
+    previous = node._frozen._children if node._frozen is not None else ()
+    by_key: Optional[dict[str, FrozenStudent]] = None
+    views = []
+    # ``students`` decodes a deferred group first.
+    for index, student in enumerate(node.students):
+        # Students mostly keep their positions; otherwise look the old view up by ID.
+        old = previous[index] if index < len(previous) else None
+        if old is not None and old.student_id != student.student_id:
+            if by_key is None:
+                by_key = {view.student_id: view for view in previous}
+            old = by_key.get(student.student_id)
+        views.append(_student(student, old, shared))
+    return FrozenGroup(node.name, tuple(views), node._parents)
+
+
+def _department(node: Department, shared: _Shared) -> FrozenDepartment:
+    return FrozenDepartment(node.name, tuple(_view(child, _group, shared) for child in node.groups), node._parents)
+
+
+def _faculty(node: Faculty, shared: _Shared) -> FrozenFaculty:
+    return FrozenFaculty(
+        node.name, tuple(_view(child, _department, shared) for child in node.departments), node._parents
+    )
+
+
+def _course(node: Course, shared: _Shared) -> FrozenCourse:
+    return FrozenCourse(node.number, tuple(_view(child, _faculty, shared) for child in node.faculties), node._parents)
+
+
+def _institute(node: Institute, shared: _Shared) -> FrozenInstitute:
+    return FrozenInstitute(node.name, tuple(_view(child, _course, shared) for child in node.courses), ())
+
+
+def freeze(institute: Institute) -> FrozenInstitute:
+    """Return the current view of ``institute``, rebuilding only what changed since the last one."""
+    return _view(institute, _institute, {})
@@ -0,0 +1,174 @@
+"""Columnar grade storage and vectorized grade aggregates.
+
+Each group can keep its students' grades and IDs in parallel NumPy arrays. The
+column is built on first use and then kept current by the group's add, remove
+and grade events, so aggregates over any subtree reduce a few arrays instead of
+looping over ``Student`` objects. NumPy is optional: everything else in the
+package works without it, only the functions here require it.
+
+Aggregates follow traversal semantics: a student reachable through several
+routes below the queried entity is counted once per route.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+from .student import Student
+
+_INITIAL_CAPACITY = 8
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for columnar grade storage")
+
+
+class GradeColumn:
+    """Grades and student IDs of one group stored as parallel arrays.
+
+    Removed students leave a NaN hole that the next added student reuses, so
+    updates never shift other entries. Grades are validated to lie in 0..100,
+    so NaN never marks a live slot.
+    """
+
+    def __init__(self, students: Iterable[Student]) -> None:
+        _require_numpy()
+        students = list(students)
+        size = len(students)
+        capacity = max(size, _INITIAL_CAPACITY)
+        self._grades = np.full(capacity, np.nan)
+        self._ids = np.empty(capacity, dtype=object)
+        self._grades[:size] = [student.average_grade for student in students]
+        self._ids[:size] = [student.student_id for student in students]
+        self._slots = {student.student_id: slot for slot, student in enumerate(students)}
+        self._size = size
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, student: Student) -> None:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size == len(self._grades):
+                self._grow()
+            slot = self._size
+            self._size += 1
+        self._grades[slot] = student.average_grade
+        self._ids[slot] = student.student_id
+        self._slots[student.student_id] = slot
+
+    def remove(self, student_id: str) -> None:
+        slot = self._slots.pop(student_id)
+        self._grades[slot] = np.nan
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    def update(self, student_id: str, grade: float) -> None:
+        self._grades[self._slots[student_id]] = grade
+
+    def apply(self, event: str, student: Student) -> None:
+        """Mirror an event a student reported to its group."""
+        if event == "attach":
+            self.add(student)
+        elif event == "detach":
+            self.remove(student.student_id)
+        elif event == "grade":
+            self.update(student.student_id, student.average_grade)
+
+    def _grow(self) -> None:
+        capacity = len(self._grades) * 2
+        grades = np.full(capacity, np.nan)
+        grades[: self._size] = self._grades[: self._size]
+        ids = np.empty(capacity, dtype=object)
+        ids[: self._size] = self._ids[: self._size]
+        self._grades, self._ids = grades, ids
+
+    def _live(self) -> Any:
+        return ~np.isnan(self._grades[: self._size])
+
+    def grades(self) -> Any:
+        """Return the grades of the group's students; the array must not be modified."""
+        if not self._free:
+            return self._grades[: self._size]
+        return self._grades[: self._size][self._live()]
+
+    def ids(self) -> Any:
+        """Return the student IDs aligned with ``grades()``."""
+        if not self._free:
+            return self._ids[: self._size]
+        return self._ids[: self._size][self._live()]
+
+
+def _groups_below(node: Any) -> list[Any]:
+    """Return every group under ``node`` (itself if it is a group), once per route."""
+    nodes = [node]
+    while nodes and not hasattr(nodes[0], "grade_column"):
+        nodes = [child for parent in nodes for child in parent._children()]
+    return nodes
+
+
+def _columns(node: Any) -> list[GradeColumn]:
+    _require_numpy()
+    return [group.grade_column() for group in _groups_below(node)]
+
+
+def grade_array(node: Any) -> Any:
+    """Return the grades of every student below ``node`` as one array."""
+    columns = _columns(node)
+    if not columns:
+        return np.empty(0)
+    return np.concatenate([column.grades() for column in columns])
+
+
+def summarize(node: Any) -> dict[str, float]:
+    """Return the count, mean, standard deviation, minimum and maximum grade below ``node``."""
+    grades = grade_array(node)
+    if not grades.size:
+        return {"count": 0, "mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0}
+    return {
+        "count": int(grades.size),
+        "mean": float(grades.mean()),
+        "std": float(grades.std()),
+        "min": float(grades.min()),
+        "max": float(grades.max()),
+    }
+
+
+def percentile(node: Any, q: float) -> float:
+    """Return the ``q``-th percentile (0..100) of the grades below ``node``."""
+    if not 0.0 <= q <= 100.0:
+        raise ValueError("q must be between 0 and 100")
+    grades = grade_array(node)
+    if not grades.size:
+        raise ValueError(f"No students found in {node.name}")
+    return float(np.percentile(grades, q))
+
+
+def students_at_least(node: Any, threshold: float) -> list[str]:
+    """Return the IDs of students below ``node`` whose grade is at least ``threshold``."""
+    matches: list[str] = []
+    for column in _columns(node):
+        matches.extend(column.ids()[column.grades() >= threshold].tolist())
+    return matches
+
+
+def means_by_child(node: Any) -> dict[Any, float]:
+    """Return the mean grade below each direct child of ``node``, keyed by child key.
+
+    Children without students are left out.
+    """
+    if hasattr(node, "grade_column"):
+        raise TypeError("means_by_child needs an entity above the group level")
+    means: dict[Any, float] = {}
+    for child in node._children():
+        grades = grade_array(child)
+        if grades.size:
+            means[child._key] = float(grades.mean())
+    return means
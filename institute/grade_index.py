@@ -0,0 +1,139 @@
+"""Grade-ordered index over student paths."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Any, Iterable, Iterator, Sequence
+
+Key = tuple[float, int]
+
+
+class SortedKeys:
+    """Sorted set of keys split into bounded buckets.
+
+    Lookups bisect the bucket maxima and then one bucket, so inserting or removing
+    a key moves at most a bucket's worth of references instead of the whole list.
+    """
+
+    _LOAD = 512
+
+    def __init__(self, keys: Iterable[Key] = ()) -> None:
+        ordered = sorted(keys)
+        load = self._LOAD
+        self._buckets = [ordered[start : start + load] for start in range(0, len(ordered), load)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(ordered)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: Key) -> None:
+        buckets, maxes = self._buckets, self._maxes
+        if not buckets:
+            buckets.append([key])
+            maxes.append(key)
+        else:
+            index = min(bisect_left(maxes, key), len(maxes) - 1)
+            bucket = buckets[index]
+            insort(bucket, key)
+            maxes[index] = bucket[-1]
+            if len(bucket) > 2 * self._LOAD:
+                half = len(bucket) // 2
+                buckets.insert(index + 1, bucket[half:])
+                del bucket[half:]
+                maxes[index] = bucket[-1]
+                maxes.insert(index + 1, buckets[index + 1][-1])
+        self._len += 1
+
+    def remove(self, key: Key) -> None:
+        index = bisect_left(self._maxes, key)
+        bucket = self._buckets[index] if index < len(self._buckets) else []
+        position = bisect_left(bucket, key)
+        if position == len(bucket) or bucket[position] != key:
+            raise KeyError(key)
+        del bucket[position]
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+        self._len -= 1
+
+    def __iter__(self) -> Iterator[Key]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __reversed__(self) -> Iterator[Key]:
+        for bucket in reversed(self._buckets):
+            yield from reversed(bucket)
+
+    def irange(self, low: Key, high: Key) -> Iterator[Key]:
+        """Yield the keys between ``low`` and ``high`` inclusive, in ascending order."""
+        index = bisect_left(self._maxes, low)
+        if index == len(self._buckets):
+            return
+        start = bisect_left(self._buckets[index], low)
+        for bucket in islice(self._buckets, index, None):
+            end = bisect_right(bucket, high)
+            yield from bucket[start:end]
+            if end < len(bucket):
+                return
+            start = 0
+
+
+class GradeIndex:
+    """Student paths below ``scope`` ordered by grade; ``None`` covers every student.
+
+    Students with equal grades come out in a stable but unspecified order.
+    """
+
+    def __init__(self, scope: Any, paths: Iterable[Sequence[Any]]) -> None:
+        self.scope = scope
+        self._next_sequence = 0
+        # Identities of the path's entities -> sort key; sequence -> path.
+        self._keys_by_path: dict[tuple[int, ...], Key] = {}
+        self._paths: dict[int, Any] = {}
+        for path in paths:
+            self._register(path)
+        self._sorted = SortedKeys(self._keys_by_path.values())
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def _register(self, path: Sequence[Any]) -> Key:
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        key = (path[-1].average_grade, sequence)
+        self._keys_by_path[tuple(map(id, path))] = key
+        self._paths[sequence] = path
+        return key
+
+    def add(self, path: Sequence[Any]) -> None:
+        self._sorted.add(self._register(path))
+
+    def discard(self, path: Sequence[Any]) -> None:
+        key = self._keys_by_path.pop(tuple(map(id, path)), None)
+        if key is not None:
+            self._sorted.remove(key)
+            del self._paths[key[1]]
+
+    def regrade(self, path: Sequence[Any]) -> None:
+        """Move a student to the position of its current grade."""
+        identity = tuple(map(id, path))
+        key = self._keys_by_path.get(identity)
+        if key is None:
+            return
+        self._sorted.remove(key)
+        key = (path[-1].average_grade, key[1])
+        self._sorted.add(key)
+        self._keys_by_path[identity] = key
+
+    def top(self, count: int) -> list[Any]:
+        return [self._paths[key[1]] for key in islice(reversed(self._sorted), max(count, 0))]
+
+    def bottom(self, count: int) -> list[Any]:
+        return [self._paths[key[1]] for key in islice(self._sorted, max(count, 0))]
+
+    def between(self, low: float, high: float) -> list[Any]:
+        keys = self._sorted.irange((low, -1), (high, self._next_sequence))
+        return [self._paths[key[1]] for key in keys]
@@ -0,0 +1,144 @@
+"""Running grade statistics kept by every entity of the institute tree."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+HISTOGRAM_BINS = 10
+_BIN_WIDTH = 100.0 / HISTOGRAM_BINS
+
+
+def _bin(grade: float) -> int:
+    index = int(grade / _BIN_WIDTH)
+    return index if index < HISTOGRAM_BINS else HISTOGRAM_BINS - 1
+
+
+@dataclass(frozen=True)
+class GradeStats:
+    """Grade statistics of the students below an entity.
+
+    ``histogram[i]`` counts grades in ``[10 * i, 10 * (i + 1))``; the last bin also
+    holds grades of exactly 100. A student reachable through several routes is
+    counted once per route, as in traversals.
+    """
+
+    count: int
+    total: float
+    minimum: Optional[float]
+    maximum: Optional[float]
+    histogram: tuple[int, ...]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class GradeTotals:
+    """Mutable running totals behind ``GradeStats``.
+
+    Count, total and histogram are exact after every update. The minimum and
+    maximum cannot be restored from the totals once the student holding them
+    leaves, so such a removal only marks them stale and the owner recomputes
+    them from its children on the next query.
+    """
+
+    __slots__ = ("count", "total", "histogram", "minimum", "maximum", "stale")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.histogram = [0] * HISTOGRAM_BINS
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.stale = False
+
+    @classmethod
+    def of(cls, grades: Sequence[float]) -> "GradeTotals":
+        totals = cls()
+        if grades:
+            totals.count = len(grades)
+            totals.total = sum(grades)
+            totals.minimum = min(grades)
+            totals.maximum = max(grades)
+            histogram = totals.histogram
+            for grade in grades:
+                histogram[_bin(grade)] += 1
+        return totals
+
+    @classmethod
+    def restore(
+        cls, count: int, total: float, minimum: float, maximum: float, histogram: Sequence[int]
+    ) -> "GradeTotals":
+        """Rebuild the totals of a non-empty set of grades from stored statistics."""
+        totals = cls()
+        totals.count = count
+        totals.total = total
+        totals.minimum = minimum
+        totals.maximum = maximum
+        totals.histogram = list(histogram)
+        return totals
+
+    def add(self, grade: float) -> None:
+        self.count += 1
+        self.total += grade
+        self.histogram[_bin(grade)] += 1
+        if not self.stale:
+            if self.minimum is None or grade < self.minimum:
+                self.minimum = grade
+            if self.maximum is None or grade > self.maximum:
+                self.maximum = grade
+
+    def remove(self, grade: float) -> None:
+        self.count -= 1
+        self.total -= grade
+        self.histogram[_bin(grade)] -= 1
+        self._forget_extremes(grade, grade)
+
+    def merge(self, other: "GradeTotals") -> None:
+        """Add the totals of a subtree that was attached below the owner."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+        if other.stale:
+            self.stale = True
+        elif not self.stale:
+            assert other.minimum is not None and other.maximum is not None
+            if self.minimum is None or other.minimum < self.minimum:
+                self.minimum = other.minimum
+            if self.maximum is None or other.maximum > self.maximum:
+                self.maximum = other.maximum
+
+    def unmerge(self, other: "GradeTotals") -> None:
+        """Subtract the totals of a subtree that was detached from below the owner."""
+        if not other.count:
+            return
+        self.count -= other.count
+        self.total -= other.total
+        self.histogram = [mine - theirs for mine, theirs in zip(self.histogram, other.histogram)]
+        if other.stale:
+            self._forget_extremes(None, None)
+        else:
+            self._forget_extremes(other.minimum, other.maximum)
+
+    def _forget_extremes(self, low: Optional[float], high: Optional[float]) -> None:
+        if not self.count:
+            # Also drops the rounding error accumulated in the running total.
+            self.total = 0.0
+            self.minimum = self.maximum = None
+            self.stale = False
+        elif self.stale:
+            return
+        elif low is None or high is None or low <= self.minimum or high >= self.maximum:  # type: ignore[operator]
+            self.stale = True
+
+    def refresh(self, extremes: Iterable[tuple[float, float]]) -> None:
+        """Recompute the minimum and maximum from the children's extremes."""
+        lows, highs = zip(*extremes) if self.count else ((), ())
+        self.minimum = min(lows, default=None)
+        self.maximum = max(highs, default=None)
+        self.stale = False
+
+    def snapshot(self) -> GradeStats:
+        return GradeStats(self.count, self.total, self.minimum, self.maximum, tuple(self.histogram))
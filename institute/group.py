@@ -1,45 +1,118 @@
 """Group entity definition."""
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Iterable, Optional
 
+from .bulk import BulkImportError, duplicate_errors
+from .grade_columns import GradeColumn
+from .grade_stats import GradeTotals
+from .keyed_collection import KeyedCollection
 from .student import Student
-from .university_entity import UniversityEntity
+from .university_entity import References, UniversityEntity
 
 
 class Group(UniversityEntity):
     """Represent a student group."""
 
+    __slots__ = ("_students", "_loader", "_deferred_count", "_column")
+
     def __init__(self, name: str, students: Iterable[Student] | None = None) -> None:
         super().__init__(name)
-        self._students: List[Student] = []
+        self._students: KeyedCollection[str, Student] = KeyedCollection()
+        self._loader: Optional[Callable[[], Iterable[Student]]] = None
+        self._deferred_count = 0
+        self._column: Optional[GradeColumn] = None
         if students:
             for student in students:
                 self.add_student(student)
 
+    @classmethod
+    def _deferred(
+        cls,
+        name: str,
+        count: int,
+        loader: Callable[[], Iterable[Student]],
+        totals: GradeTotals,
+    ) -> "Group":
+        """Create a group whose ``count`` students are produced by ``loader`` on first access.
+
+        ``totals`` are the grade totals of those students, so statistics are right
+        before decoding.
+        """
+        group = cls(name)
+        del group._students
+        group._loader = loader
+        group._deferred_count = count
+        group._grade_totals = totals
+        return group
+
+    def __getattr__(self, attribute: str) -> object:
+        # Only reached while ``_students`` is unset, i.e. for a deferred group.
+        if attribute != "_students" or self._loader is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {attribute!r}")
+        self._hydrate()
+        return self._students
+
+    def _hydrate(self) -> None:
+        """Decode the students of a deferred group and announce them to the ancestors."""
+        loader = self._loader
+        assert loader is not None
+        self._loader = None
+        self._students = KeyedCollection()
+        for student in loader():
+            self._students.add(student.student_id, student)
+            student._attach_to(self)
+        self._propagate("load", ())
+
     @property
     def students(self) -> tuple[Student, ...]:
         """Return students as an immutable tuple."""
-        return tuple(self._students)
+        return self._students.snapshot()
 
     def add_student(self, student: Student) -> None:
         """Add a student to the group, preventing duplicates."""
         if not isinstance(student, Student):
             raise TypeError("student must be an instance of Student")
-        if any(existing.student_id == student.student_id for existing in self._students):
+        if student.student_id in self._students:
             raise ValueError(f"Student with id {student.student_id} already exists in group {self.name}")
-        self._students.append(student)
+        self._students.add(student.student_id, student)
+        student._attach_to(self)
+        self._propagate("attach", (student,))
+
+    def add_students_bulk(self, students: Iterable[Student]) -> None:
+        """Add a batch of students, or none of them if any is rejected.
+
+        Every problem in the batch is reported together in a ``BulkImportError``.
+        """
+        batch = list(students)
+        errors = [
+            f"item {position}: student must be an instance of Student"
+            for position, student in enumerate(batch)
+            if not isinstance(student, Student)
+        ]
+        if not errors:
+            ids = [student.student_id for student in batch]
+            errors = duplicate_errors(ids, self._students, f"student id in group {self.name}:")
+        if errors:
+            raise BulkImportError(errors)
+        for student in batch:
+            self._students.add(student.student_id, student)
+            student._attach_to(self)
+            self._propagate("attach", (student,))
 
     def remove_student(self, student_id: str) -> Student:
         """Remove and return a student by ID."""
-        for index, student in enumerate(self._students):
-            if student.student_id == student_id:
-                return self._students.pop(index)
-        raise ValueError(f"Student with id {student_id} not found in group {self.name}")
+        try:
+            student = self._students.pop(student_id)
+        except KeyError:
+            raise ValueError(f"Student with id {student_id} not found in group {self.name}") from None
+        student._detach_from(self)
+        self._propagate("detach", (student,))
+        return student
 
     def find_student_by_id(self, student_id: str) -> Optional[Student]:
         """Return a student by ID if present."""
-        return next((student for student in self._students if student.student_id == student_id), None)
+        return self._students.get(student_id)
 
     def find_students_by_name(self, name_fragment: str) -> list[Student]:
         """Return students whose full name contains the fragment (case-insensitive)."""
@@ -54,19 +127,51 @@ class Group(UniversityEntity):
         student.update_average_grade(new_grade)
         return student
 
+    def grade_column(self) -> GradeColumn:
+        """Return the columnar copy of the students' grades, building it on first use.
+
+        Requires NumPy. Once built, the column follows every change to the group.
+        """
+        if self._column is None:
+            self._column = GradeColumn(self._students)
+        return self._column
+
+    def _propagate(self, event: str, path: tuple[object, ...], *args: object) -> None:
+        column = self._column
+        if column is not None and len(path) == 1:
+            column.apply(event, path[0])  # type: ignore[arg-type]
+        super()._propagate(event, path, *args)
+
+    def _child_collection(self) -> KeyedCollection[str, Student]:
+        return self._students
+
+    _add_child = add_student
+    _remove_child = remove_student
+
+    def _children(self) -> tuple[Student, ...]:
+        # Deferred students are reported through a "load" event once decoded.
+        if self._loader is not None:
+            return ()
+        return self._students.snapshot()
+
+    def _clear_dirty(self) -> None:
+        self._dirty.clear()
+
     def __str__(self) -> str:
-        return f"Group {self.name} with {len(self._students)} students"
+        count = self._deferred_count if self._loader is not None else len(self._students)
+        return f"Group {self.name} with {count} students"
 
-    def to_dict(self) -> dict[str, object]:
+    def to_dict(self, refs: Optional[References] = None) -> dict[str, object]:
         """Serialize the group to a JSON-compatible dictionary."""
         return {
             "name": self.name,
-            "students": [student.to_dict() for student in self._students],
+            "students": [student._dump(refs) for student in self._students],
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, object]) -> "Group":
+    def from_dict(cls, data: dict[str, object], refs: Optional[dict[str, Any]] = None) -> "Group":
         """Create a group from a serialized dictionary."""
+        refs = {} if refs is None else refs
         students_data = data.get("students", [])
-        students = [Student.from_dict(student_data) for student_data in students_data]
+        students = [Student._load(student_data, refs) for student_data in students_data]
         return cls(name=str(data["name"]), students=students)
@@ -1,46 +1,202 @@
 """Institute aggregate entity."""
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Mapping, Optional, Sequence
 
+from .bulk import BulkImportError, ParsedRow, parse_rows
 from .course import Course
 from .department import Department
 from .faculty import Faculty
+from .frozen import FrozenEntity, FrozenInstitute, FrozenStudent, freeze
+from .grade_index import GradeIndex
 from .group import Group
+from .keyed_collection import KeyedCollection
+from .locking import ReadWriteLock
 from .student import Student
-from .university_entity import UniversityEntity
+from .university_entity import References, UniversityEntity
+
+
+StudentPath = tuple[Course, Faculty, Department, Group, Student]
+Change = dict[str, Any]
+Listener = Callable[..., None]
+
+# Entity type found at each depth below the institute.
+_LEVELS = (Course, Faculty, Department, Group, Student)
+
+# Length of the name fragments indexed for substring search.
+_GRAM = 3
+
+# Resolved paths kept by ``Institute.resolve`` before the cache starts over.
+_RESOLVE_CACHE_SIZE = 1 << 16
+
+# Grade indexes kept at once; the least recently queried scope goes first.
+_GRADE_INDEX_LIMIT = 32
+
+
+def format_path(nodes: Iterable[Any]) -> str:
+    """Return the ``Institute.resolve`` path of a chain of entities starting at a course."""
+    return "/".join(str(node._key) for node in nodes)
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1)}
 
 
 class Institute(UniversityEntity):
     """Represent an institute containing multiple courses."""
 
+    __slots__ = (
+        "_courses",
+        "_student_paths",
+        "_ids_by_name",
+        "_name_grams",
+        "_student_locator",
+        "_listeners",
+        "_grade_indexes",
+        "_resolved",
+        "_lock",
+        "_view_lock",
+    )
+
     def __init__(self, name: str, courses: Iterable[Course] | None = None) -> None:
         super().__init__(name)
-        self._courses: List[Course] = []
+        self._courses: KeyedCollection[int, Course] = KeyedCollection()
+        # Every path leading to a student, keyed by student ID. A student reachable
+        # through shared faculties or groups has one path per route.
+        self._student_paths: dict[str, list[StudentPath]] = {}
+        # Lowercased full name -> IDs of the students carrying it (a dict, to keep
+        # roughly traversal order), plus trigram -> names containing it. Names repeat
+        # a lot, so substring queries only ever check distinct names.
+        self._ids_by_name: dict[str, dict[str, None]] = {}
+        self._name_grams: dict[str, set[str]] = {}
+        # Set by lazy loaders: decodes any deferred group holding the given student ID,
+        # or every deferred group when called with ``None``.
+        self._student_locator: Optional[Callable[[Optional[str]], None]] = None
+        self._listeners: list[Listener] = []
+        # Grade-ordered indexes built on first query, keyed by the identity of their
+        # scope (``None`` for the whole institute), and kept current from then on.
+        # Ordered from least to most recently queried.
+        self._grade_indexes: dict[int, GradeIndex] = {}
+        # Path string -> entities along it, for ``resolve``; emptied whenever
+        # anything is detached, since additions cannot invalidate a resolved path.
+        self._resolved: dict[str, tuple[Any, ...]] = {}
+        self._lock = ReadWriteLock()
+        # Serializes ``snapshot`` so concurrent readers agree on one view per entity.
+        self._view_lock = threading.Lock()
         if courses:
             for course in courses:
                 self.add_course(course)
 
     @property
     def courses(self) -> tuple[Course, ...]:
-        return tuple(self._courses)
+        return self._courses.snapshot()
 
     def add_course(self, course: Course) -> None:
         if not isinstance(course, Course):
             raise TypeError("course must be an instance of Course")
-        if any(existing.number == course.number for existing in self._courses):
+        if course.number in self._courses:
             raise ValueError(f"Course with number {course.number} already exists in {self.name}")
-        self._courses.append(course)
+        self._courses.add(course.number, course)
+        course._attach_to(self)
+        self._propagate("attach", (course,))
 
     def remove_course(self, number: int) -> Course:
-        for index, course in enumerate(self._courses):
-            if course.number == number:
-                return self._courses.pop(index)
-        raise ValueError(f"Course with number {number} not found in {self.name}")
+        try:
+            course = self._courses.pop(number)
+        except KeyError:
+            raise ValueError(f"Course with number {number} not found in {self.name}") from None
+        course._detach_from(self)
+        self._propagate("detach", (course,))
+        return course
+
+    def import_rows(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Import students from ``(course, faculty, department, group, first_name,
+        last_name, student_id, average_grade)`` rows, creating missing containers.
+
+        The whole batch is validated before anything changes: every problem is
+        reported together in a ``BulkImportError`` and nothing is applied. New
+        containers are assembled detached and attached once, so a subtree that did
+        not exist before costs a single event. Returns the number of students added.
+        """
+        parsed, errors = parse_rows(rows)
+        batches: dict[tuple[int, str, str, str], list[tuple[int, ParsedRow]]] = {}
+        for number, row in parsed:
+            batches.setdefault(row[:4], []).append((number, row))
+        for (course, faculty, department, group_name), batch in batches.items():
+            group = self._existing_group(course, faculty, department, group_name)
+            seen: set[str] = set()
+            for number, row in batch:
+                student_id = row[6]
+                if student_id in seen or (group is not None and student_id in group._students):
+                    errors.append((number, f"student with id {student_id} already exists in group {group_name}"))
+                seen.add(student_id)
+        if errors:
+            raise BulkImportError([f"row {number}: {message}" for number, message in sorted(errors)])
+
+        created: dict[tuple[int, Any], UniversityEntity] = {}
+        pending: list[tuple[int, UniversityEntity, UniversityEntity]] = []
+
+        def child(depth: int, parent: UniversityEntity, key: Any, make: Callable[[], UniversityEntity]) -> Any:
+            node = parent._child_collection().get(key)  # type: ignore[union-attr]
+            if node is None:
+                node = created.get((id(parent), key))
+                if node is None:
+                    node = created[(id(parent), key)] = make()
+                    pending.append((depth, parent, node))
+            return node
+
+        for (number, faculty_name, department_name, group_name), batch in batches.items():
+            course = child(0, self, number, lambda: Course(number))
+            faculty = child(1, course, faculty_name, lambda: Faculty(faculty_name))
+            department = child(2, faculty, department_name, lambda: Department(department_name))
+            group = child(3, department, group_name, lambda: Group(group_name))
+            group.add_students_bulk([Student._unchecked(*row[4:]) for _, row in batch])
+        # Deepest first, so every new subtree is complete before it is attached.
+        for _, parent, node in sorted(pending, key=lambda entry: -entry[0]):
+            parent._add_child(node)  # type: ignore[attr-defined]
+        return len(parsed)
+
+    def _existing_group(self, number: int, faculty: str, department: str, group: str) -> Optional[Group]:
+        course_node = self._courses.get(number)
+        faculty_node = course_node.find_faculty(faculty) if course_node else None
+        department_node = faculty_node.find_department(department) if faculty_node else None
+        return department_node.find_group(group) if department_node else None
 
     def find_course(self, number: int) -> Optional[Course]:
         """Return a course by number if present."""
-        return next((course for course in self._courses if course.number == number), None)
+        return self._courses.get(number)
+
+    def resolve(self, path: str) -> tuple[Any, ...]:
+        """Return the entities along a ``course/faculty/department/group/student_id`` path.
+
+        Any leading part of the path may be given: ``"3/Science/Mathematics/Group A"``
+        returns ``(course, faculty, department, group)`` like ``find_group``. Results
+        are cached until something is removed from the institute. Raises
+        ``ValueError`` if the path is malformed or leads nowhere.
+        """
+        nodes = self._resolved.get(path)
+        if nodes is not None:
+            return nodes
+        parts = [part.strip() for part in path.split("/")]
+        if len(parts) > len(_LEVELS) or not all(parts):
+            raise ValueError(f"Invalid path {path!r}; expected course/faculty/department/group/student_id")
+        try:
+            keys: list[Any] = [int(parts[0]), *parts[1:]]
+        except ValueError:
+            raise ValueError(f"Invalid course number in path {path!r}") from None
+        node: Any = self
+        found = []
+        for key in keys:
+            node = node._child_collection().get(key)
+            if node is None:
+                raise ValueError(f"No entity found at path {path!r}")
+            found.append(node)
+        if len(self._resolved) >= _RESOLVE_CACHE_SIZE:
+            self._resolved.clear()
+        nodes = self._resolved[path] = tuple(found)
+        return nodes
 
     def find_faculty(self, name: str) -> Optional[tuple[Course, Faculty]]:
         for course in self._courses:
@@ -66,44 +222,454 @@ class Institute(UniversityEntity):
                         return course, faculty, department, group
         return None
 
-    def find_student_by_id(
-        self, student_id: str
-    ) -> Optional[tuple[Course, Faculty, Department, Group, Student]]:
-        for course in self._courses:
-            for faculty in course.faculties:
-                for department in faculty.departments:
-                    for group in department.groups:
-                        student = group.find_student_by_id(student_id)
-                        if student:
-                            return course, faculty, department, group, student
-        return None
+    def find_student_by_id(self, student_id: str) -> Optional[StudentPath]:
+        if self._student_locator is not None:
+            self._student_locator(student_id)
+        paths = self._student_paths.get(student_id)
+        if not paths:
+            return None
+        if len(paths) == 1:
+            return paths[0]
+        return min(paths, key=self._path_order)
 
     def find_students_by_name(
         self, name_fragment: str
     ) -> list[tuple[Course, Faculty, Department, Group, Student]]:
-        matches: list[tuple[Course, Faculty, Department, Group, Student]] = []
-        for course in self._courses:
-            for faculty in course.faculties:
-                for department in faculty.departments:
-                    for group in department.groups:
-                        for student in group.find_students_by_name(name_fragment):
-                            matches.append((course, faculty, department, group, student))
+        """Return the paths of students whose full name contains the fragment.
+
+        Matching is case-insensitive and results follow traversal order.
+        """
+        if self._student_locator is not None:
+            self._student_locator(None)
+        fragment = name_fragment.lower()
+        if not fragment:
+            return [path for course in self._courses for path in self._iter_student_paths((course,))]
+        if len(fragment) < _GRAM:
+            names: Iterable[str] = self._ids_by_name
+        else:
+            postings = sorted((self._name_grams.get(gram, set()) for gram in _grams(fragment)), key=len)
+            names = postings[0].intersection(*postings[1:])
+        candidates: dict[str, None] = {}
+        for name in names:
+            if fragment in name:
+                candidates.update(self._ids_by_name[name])
+        if len(candidates) * 4 > len(self._student_paths):
+            return self._walk_matches(fragment, candidates)
+        matches: list[StudentPath] = []
+        for student_id in candidates:
+            paths = self._student_paths[student_id]
+            if len(paths) == 1:
+                matches.append(paths[0])
+            else:
+                # Students sharing an ID across groups may carry different names.
+                matches.extend(path for path in paths if fragment in path[-1].full_name.lower())
+        # Matches sharing a group share the position of its course, faculty and so on.
+        group_orders: dict[tuple[object, ...], tuple[int, ...]] = {}
+
+        def order(path: StudentPath) -> tuple[tuple[int, ...], int]:
+            prefix = path[:4]
+            group_order = group_orders.get(prefix)
+            if group_order is None:
+                group_order = group_orders[prefix] = self._path_order(path)
+            return group_order, path[3]._students.position(path[4].student_id)
+
+        matches.sort(key=order)
         return matches
 
+    def top_students(self, count: int, scope: Optional[UniversityEntity] = None) -> list[StudentPath]:
+        """Return the ``count`` students with the highest grades, best first.
+
+        ``scope`` limits the search to the students below a course, faculty,
+        department or group.
+        """
+        return self._grade_index(scope).top(count)
+
+    def bottom_students(self, count: int, scope: Optional[UniversityEntity] = None) -> list[StudentPath]:
+        """Return the ``count`` students with the lowest grades, lowest first."""
+        return self._grade_index(scope).bottom(count)
+
+    def students_in_grade_range(
+        self, low: float, high: float, scope: Optional[UniversityEntity] = None
+    ) -> list[StudentPath]:
+        """Return the students whose grade lies between ``low`` and ``high`` inclusive, ascending."""
+        return self._grade_index(scope).between(low, high)
+
+    def _grade_index(self, scope: Optional[UniversityEntity]) -> GradeIndex:
+        if scope is self:
+            scope = None
+        if scope is not None and not isinstance(scope, (Course, Faculty, Department, Group)):
+            raise TypeError("scope must be a course, faculty, department or group")
+        indexes = self._grade_indexes
+        index = indexes.pop(id(scope), None)
+        if index is None:
+            if self._student_locator is not None:
+                self._student_locator(None)
+            if scope is None:
+                paths = [path for paths in self._student_paths.values() for path in paths]
+            else:
+                routes = self._routes(scope)
+                paths = [path for route in routes for path in self._iter_student_paths(route)]
+                if not routes:
+                    # Not part of this institute, so no event would ever update it.
+                    return GradeIndex(scope, ())
+            index = GradeIndex(scope, paths)
+            if len(indexes) >= _GRADE_INDEX_LIMIT:
+                del indexes[next(iter(indexes))]
+        # The index holds on to its scope, so the identity key stays valid.
+        indexes[id(scope)] = index
+        return index
+
+    def _indexes_on(self, path: Sequence[Any]) -> list[GradeIndex]:
+        """Return the grade indexes whose scope is the institute or an entity on ``path``."""
+        indexes = self._grade_indexes
+        if not indexes:
+            return []
+        keys = (id(None), *(id(node) for node in path[:-1]))
+        return [indexes[key] for key in keys if key in indexes]
+
+    def _drop_grade_indexes(self, node: Any) -> None:
+        """Forget the indexes scoped at or below a detached entity that is now unreachable."""
+        if not self._grade_indexes or not isinstance(node, UniversityEntity):
+            return
+        pending = [node]
+        while pending:
+            entity = pending.pop()
+            if self._routes(entity):
+                continue
+            self._grade_indexes.pop(id(entity), None)
+            pending.extend(child for child in entity._children() if isinstance(child, UniversityEntity))
+
+    def _routes(self, node: Any) -> list[tuple[Any, ...]]:
+        """Return every path from a course down to ``node``; none if it is outside the institute."""
+        if node is self:
+            return [()]
+        return [(*route, node) for parent in node._parents for route in self._routes(parent)]
+
+    def _walk_matches(self, fragment: str, candidates: Mapping[str, None]) -> list[StudentPath]:
+        """Collect matching students in traversal order, cheaper than sorting large results."""
+        prefixes: list[tuple[Any, ...]] = [(course,) for course in self._courses]
+        for _ in range(3):
+            prefixes = [(*prefix, child) for prefix in prefixes for child in prefix[-1]._children()]
+        matches: list[StudentPath] = []
+        for prefix in prefixes:
+            for student in prefix[-1]._students:
+                student_id = student.student_id
+                if student_id in candidates and (
+                    len(self._student_paths[student_id]) == 1 or fragment in student.full_name.lower()
+                ):
+                    matches.append((*prefix, student))  # type: ignore[arg-type]
+        return matches
+
+    def _child_collection(self) -> KeyedCollection[int, Course]:
+        return self._courses
+
+    _add_child = add_course
+    _remove_child = remove_course
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call ``listener(event, path, *args)`` after every change below the institute.
+
+        ``event`` is ``"attach"``, ``"detach"``, ``"grade"`` (with the old grade),
+        ``"rename"`` (with the old full name) or ``"load"`` (a lazily loaded group
+        decoded its students); ``path`` runs from a course down to the entity concerned.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """Hold the read side of the institute's lock for a block of lookups.
+
+        Entities are not synchronized themselves: threads sharing an institute read
+        inside ``reading()`` and change anything below it inside ``writing()``. Any
+        number of readers run together; a writer waits for them and runs alone.
+        A lazily loaded institute is decoded in full, under the write lock, the
+        first time it is read this way, since decoding updates the indexes.
+        """
+        if self._student_locator is not None:
+            with self._lock.write():
+                if self._student_locator is not None:
+                    self._student_locator(None)
+        with self._lock.read():
+            yield
+
+    def writing(self) -> ContextManager[None]:
+        """Hold the write side of the institute's lock; see ``reading``."""
+        return self._lock.write()
+
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        # A copy gets fresh locks and no listeners, and rebuilds its query caches,
+        # which are keyed by the identity of the original entities.
+        _, slots = super().__getstate__()
+        for name in ("_lock", "_view_lock", "_listeners", "_grade_indexes", "_resolved"):
+            del slots[name]
+        return None, slots
+
+    def __setstate__(self, state: tuple[None, dict[str, Any]]) -> None:
+        super().__setstate__(state)
+        self._listeners = []
+        self._grade_indexes = {}
+        self._resolved = {}
+        self._lock = ReadWriteLock()
+        self._view_lock = threading.Lock()
+
+    def snapshot(self) -> FrozenInstitute:
+        """Return a read-only view of the institute as it is now.
+
+        Later changes leave the view as it was. Views are cached per entity and
+        dropped along the path of each change, so with nothing changed this is
+        constant time; otherwise only the changed paths are copied and the rest
+        is shared with the previous snapshot. The institute keeps the latest views
+        cached, about 85 bytes per student once a snapshot has been taken.
+        Deferred groups are decoded first.
+        From several threads, call it inside ``reading()``.
+        """
+        with self._view_lock:
+            return freeze(self)
+
+    def _children(self) -> tuple[Course, ...]:
+        return self._courses.snapshot()
+
+    def _propagate(self, event: str, path: tuple[object, ...], *args: object) -> None:
+        """Apply an event reported by a descendant to the institute-wide indexes."""
+        self._mark_dirty(event, path)
+        self._update_totals(event, path, *args)
+        self._stale = True
+        if event in ("attach", "load"):
+            for student_path in self._iter_student_paths(path):
+                self._student_paths.setdefault(student_path[-1].student_id, []).append(student_path)
+                self._index_name(student_path[-1])
+                for index in self._indexes_on(student_path):
+                    index.add(student_path)
+        elif event == "detach":
+            self._resolved.clear()
+            for student_path in self._iter_student_paths(path):
+                self._forget_student_path(student_path)
+                self._unindex_name(student_path[-1].full_name, student_path[-1].student_id)
+                for index in self._indexes_on(student_path):
+                    index.discard(student_path)
+            self._drop_grade_indexes(path[-1])
+        elif event == "grade":
+            for index in self._indexes_on(path):
+                index.regrade(path)
+        elif event == "rename":
+            student = path[-1]
+            self._unindex_name(str(args[0]), student.student_id)  # type: ignore[attr-defined]
+            self._index_name(student)  # type: ignore[arg-type]
+        for listener in self._listeners:
+            listener(event, path, *args)
+
+    def _iter_student_paths(self, path: tuple[object, ...]) -> list[StudentPath]:
+        """Expand a path to a node into the paths of every student below it."""
+        paths = [path]
+        while paths and not isinstance(paths[0][-1], Student):
+            paths = [(*prefix, child) for prefix in paths for child in prefix[-1]._children()]  # type: ignore[attr-defined]
+        return paths  # type: ignore[return-value]
+
+    def _forget_student_path(self, student_path: StudentPath) -> None:
+        student_id = student_path[-1].student_id
+        paths = self._student_paths.get(student_id, [])
+        for index, existing in enumerate(paths):
+            if all(a is b for a, b in zip(existing, student_path)):
+                del paths[index]
+                break
+        if not paths:
+            self._student_paths.pop(student_id, None)
+
+    def _index_name(self, student: Student) -> None:
+        name = student.full_name.lower()
+        ids = self._ids_by_name.get(name)
+        if ids is None:
+            ids = self._ids_by_name[name] = {}
+            for gram in _grams(name):
+                self._name_grams.setdefault(gram, set()).add(name)
+        ids[student.student_id] = None
+
+    def _unindex_name(self, full_name: str, student_id: str) -> None:
+        """Drop a name from a student ID once no remaining path with that ID carries it."""
+        name = full_name.lower()
+        if any(path[-1].full_name.lower() == name for path in self._student_paths.get(student_id, ())):
+            return
+        ids = self._ids_by_name.get(name)
+        if ids is None:
+            return
+        ids.pop(student_id, None)
+        if ids:
+            return
+        del self._ids_by_name[name]
+        for gram in _grams(name):
+            names = self._name_grams[gram]
+            names.discard(name)
+            if not names:
+                del self._name_grams[gram]
+
+    def _path_order(self, path: StudentPath) -> tuple[int, ...]:
+        """Return the position of a student path in depth-first traversal order."""
+        course, faculty, department, group, _ = path
+        return (
+            self._courses.position(course.number),
+            course._faculties.position(faculty.name),
+            faculty._departments.position(department.name),
+            department._groups.position(group.name),
+        )
+
+    def _node_at(self, keys: Sequence[Any]) -> Any:
+        """Return the entity reached by following child keys from the institute."""
+        node: Any = self
+        for key in keys:
+            collection = node._child_collection() if isinstance(node, UniversityEntity) else None
+            child = collection.get(key) if collection is not None else None
+            if child is None:
+                raise ValueError(f"No entity found at path {list(keys)}")
+            node = child
+        return node
+
+    def _collect_changes(self) -> tuple[list[Change], list[tuple[UniversityEntity, bool]]]:
+        """Describe the changes recorded since the last incremental save.
+
+        Returns the change records and the entities whose records must be cleared
+        once they are persisted, flagged ``True`` when the whole subtree is covered.
+        Nothing is cleared here, so shared entities are described once per path.
+        """
+        changes: list[Change] = []
+        cleared: list[tuple[UniversityEntity, bool]] = []
+
+        def walk(node: UniversityEntity, keys: list[Any]) -> None:
+            cleared.append((node, False))
+            if not node._dirty:
+                return
+            collection = node._child_collection()
+            for key, mark in node._dirty.items():
+                child = collection.get(key)
+                if child is None:
+                    changes.append({"op": "delete", "path": [*keys, key]})
+                elif mark != "changed":
+                    changes.append({"op": "add", "path": keys, "data": child.to_dict()})
+                    if isinstance(child, UniversityEntity):
+                        cleared.append((child, True))
+                elif isinstance(child, UniversityEntity):
+                    walk(child, [*keys, key])
+                else:
+                    changes.append({"op": "update", "path": [*keys, key], "data": child.to_dict()})
+
+        walk(self, [])
+        return changes, cleared
+
+    def _apply_change(self, change: Mapping[str, Any]) -> None:
+        """Apply one change record produced by ``_collect_changes``."""
+        operation = change["op"]
+        keys = list(change["path"])
+        if operation == "add":
+            parent = self._node_at(keys)
+            child = _LEVELS[len(keys)].from_dict(change["data"])
+            if child._key in parent._child_collection():
+                parent._remove_child(child._key)
+            parent._add_child(child)
+        elif operation == "delete":
+            parent = self._node_at(keys[:-1])
+            if keys[-1] in parent._child_collection():
+                parent._remove_child(keys[-1])
+        elif operation == "update":
+            student = self._node_at(keys)
+            data = change["data"]
+            first_name, last_name = str(data["first_name"]), str(data["last_name"])
+            if (first_name, last_name) != (student.first_name, student.last_name):
+                student.rename(first_name, last_name)
+            student.update_average_grade(float(data["average_grade"]))
+        else:
+            raise ValueError(f"Unknown change operation {operation!r}")
+
+    def diff(self, other: Institute | FrozenInstitute) -> list[Change]:
+        """Return the change records that turn ``other`` into this institute.
+
+        ``other`` is another institute or a ``snapshot()``. Each level compares the
+        two sides' children by key, so nothing is matched pairwise. Subtrees that
+        are the same object on both sides are skipped without being visited, and
+        snapshots of one institute share everything that did not change between
+        them, so diffing against an earlier snapshot of this institute costs time
+        in proportion to the changes. The records use the change log format
+        (``add``, ``delete``, ``update``), with added subtrees in full, and are
+        applied with ``apply_patch``. Children that changed position are deleted
+        and added again, so the order matches too. Names of the institutes are
+        not compared.
+        """
+        changes: list[Change] = []
+
+        def walk(before: FrozenEntity, after: FrozenEntity, keys: list[Any]) -> None:
+            if before is after:
+                return
+            previous = {child._key: child for child in before._children}
+            current = {child._key: child for child in after._children}
+            # An add appends, so the children kept in place must come first in
+            # ``current`` and in their old order; every common key after the first
+            # new or out-of-order one is deleted and added again at the end.
+            positions = {key: index for index, key in enumerate(previous)}
+            moved: set[Any] = set()
+            in_place = True
+            last = -1
+            for key in current:
+                index = positions.get(key)
+                if in_place and index is not None and index > last:
+                    last = index
+                else:
+                    in_place = False
+                    if index is not None:
+                        moved.add(key)
+            for key in previous:
+                if key not in current or key in moved:
+                    changes.append({"op": "delete", "path": [*keys, key]})
+            for key, child in current.items():
+                old = previous.get(key)
+                if old is None or key in moved:
+                    changes.append({"op": "add", "path": keys, "data": child.to_dict()})
+                elif isinstance(child, FrozenStudent):
+                    if old is not child and (
+                        (old.first_name, old.last_name, old.average_grade)
+                        != (child.first_name, child.last_name, child.average_grade)
+                    ):
+                        changes.append({"op": "update", "path": [*keys, key], "data": child.to_dict()})
+                else:
+                    walk(old, child, [*keys, key])
+
+        walk(other.snapshot() if isinstance(other, Institute) else other, self.snapshot(), [])
+        return changes
+
+    def apply_patch(self, changes: Iterable[Mapping[str, Any]]) -> int:
+        """Apply change records from ``diff`` or a change log in order; return how many.
+
+        An add replaces an existing child with the same key and a delete of a
+        missing child is ignored, so a patch can be applied more than once.
+        """
+        count = 0
+        for change in changes:
+            self._apply_change(change)
+            count += 1
+        return count
+
     def __str__(self) -> str:
         course_info = ", ".join(str(course) for course in self._courses) or "no courses"
         return f"Institute {self.name} offering: {course_info}"
 
-    def to_dict(self) -> dict[str, object]:
-        """Serialize the institute to a JSON-compatible dictionary."""
+    def to_dict(self, references: bool = False) -> dict[str, object]:
+        """Serialize the institute to a JSON-compatible dictionary.
+
+        By default an entity held by several parents is written out under each of
+        them. With ``references`` its first copy carries an ``"$id"`` and later
+        ones are written as ``{"$ref": id}``, which ``from_dict`` turns back into
+        the one shared entity.
+        """
+        refs = References(self) if references else None
         return {
             "name": self.name,
-            "courses": [course.to_dict() for course in self._courses],
+            "courses": [course._dump(refs) for course in self._courses],
         }
 
     @classmethod
     def from_dict(cls, data: dict[str, object]) -> "Institute":
         """Create an institute from a serialized dictionary."""
+        refs: dict[str, Any] = {}
         courses_data = data.get("courses", [])
-        courses = [Course.from_dict(course_data) for course_data in courses_data]
+        courses = [Course._load(course_data, refs) for course_data in courses_data]
         return cls(name=str(data["name"]), courses=courses)
@@ -0,0 +1,227 @@
+"""Write-ahead journal of institute mutations."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, wait as wait_for
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from .data_manager import DataManager, _save_executor
+from .frozen import FrozenInstitute
+from .institute import Change, Institute
+
+JOURNAL_SUFFIX = ".journal"
+
+
+def journal_path(snapshot_path: Path) -> Path:
+    """Return the journal that accompanies the snapshot at ``snapshot_path``."""
+    return snapshot_path.with_name(snapshot_path.name + JOURNAL_SUFFIX)
+
+
+def change_for_event(event: str, path: tuple[Any, ...]) -> Optional[Change]:
+    """Translate an institute event into the change record format used by the logs."""
+    keys = [node._key for node in path]
+    if event == "attach":
+        return {"op": "add", "path": keys[:-1], "data": path[-1].to_dict()}
+    if event == "detach":
+        return {"op": "delete", "path": keys}
+    if event in ("grade", "rename"):
+        return {"op": "update", "path": keys, "data": path[-1].to_dict()}
+    return None
+
+
+class Journal:
+    """Append every add, remove, rename and grade update of an institute to a journal file.
+
+    Records are flushed to the operating system as they are written and fsynced in
+    batches, every ``sync_every`` records or ``sync_interval`` seconds, whichever
+    comes first. The journal is tied to the snapshot it extends: ``replay`` applies
+    it on top of that snapshot and ``checkpoint`` writes a new snapshot and starts
+    an empty journal.
+
+    The institute passed in must match the snapshot with its journal replayed. A
+    missing journal, or one left from an older snapshot, is replaced by an empty
+    journal for the current snapshot; only without a snapshot is one written
+    straight away.
+
+    ``checkpoint_background`` writes the snapshot from another thread; records made
+    meanwhile go to the current journal and are carried over to the new one.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str | Path,
+        institute: Institute,
+        sync_every: int = 64,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self._snapshot_path = Path(snapshot_path)
+        self._path = journal_path(self._snapshot_path)
+        self._institute = institute
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._handle: Optional[TextIO] = None
+        # Guards the handle against the thread finishing a background checkpoint.
+        self._lock = threading.Lock()
+        # Records written since each running background checkpoint froze the institute.
+        self._carried: list[list[str]] = []
+        self._checkpoint_future: Optional[Future[None]] = None
+        if self._matches_snapshot():
+            self._handle = self._path.open("a", encoding="utf-8")
+        elif self._snapshot_path.exists():
+            self._start()
+        else:
+            self.checkpoint()
+        institute.add_listener(self._record)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self._snapshot_path
+
+    def _matches_snapshot(self) -> bool:
+        if not (self._snapshot_path.exists() and self._path.exists()):
+            return False
+        with self._path.open(encoding="utf-8") as handle:
+            try:
+                header = json.loads(handle.readline() or "null")
+            except json.JSONDecodeError:
+                return False
+        return header == DataManager._log_header(self._snapshot_path)
+
+    @staticmethod
+    def replay(institute: Institute, snapshot_path: str | Path) -> int:
+        """Apply the journal of ``snapshot_path`` to an institute loaded from it.
+
+        Returns the number of records applied. A journal written against an older
+        snapshot is ignored, as is a torn final record.
+        """
+        path = Path(snapshot_path)
+        return DataManager._replay_log(institute, journal_path(path), path)
+
+    def _record(self, event: str, path: tuple[Any, ...], *args: object) -> None:
+        change = change_for_event(event, path)
+        if change is None or self._handle is None:
+            return
+        line = json.dumps(change, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._handle is None:
+                return  # Closed while the record was being encoded.
+            self._handle.write(line)
+            self._handle.flush()
+            for carried in self._carried:
+                carried.append(line)
+        self._unsynced += 1
+        if (
+            self._unsynced >= self._sync_every
+            or time.monotonic() - self._last_sync >= self._sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force the records written so far to stable storage."""
+        with self._lock:
+            if self._handle is not None and self._unsynced:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def wait(self) -> None:
+        """Block until the background checkpoints are done.
+
+        Their errors are reported through the futures ``checkpoint_background`` returned.
+        """
+        future, self._checkpoint_future = self._checkpoint_future, None
+        if future is not None:
+            wait_for([future])
+
+    def checkpoint_background(self) -> Future[None]:
+        """Start a checkpoint whose snapshot is written by a background thread.
+
+        The institute is frozen before this returns. A crash before the new journal
+        replaces the old one loses the records made while the snapshot was written,
+        as the old journal no longer matches the new snapshot.
+        """
+        carried: list[str] = []
+        with self._lock:
+            self._carried.append(carried)
+        with self._institute.reading():
+            frozen = self._institute.snapshot()
+        file_format = DataManager.detect_format(self._snapshot_path)
+        future = _save_executor.submit(self._finish_checkpoint, frozen, file_format, carried)
+        self._checkpoint_future = future
+        return future
+
+    def _finish_checkpoint(self, frozen: FrozenInstitute, file_format: str, carried: list[str]) -> None:
+        try:
+            DataManager.save(frozen, self._snapshot_path, file_format=file_format)
+            header = json.dumps(DataManager._log_header(self._snapshot_path)) + "\n"
+        except BaseException:
+            with self._lock:
+                self._carried.remove(carried)
+            raise
+        with self._lock:
+            self._carried.remove(carried)
+            fd, temp_name = tempfile.mkstemp(prefix=f".{self._path.name}.", dir=self._path.parent)
+            with open(fd, "w", encoding="utf-8") as handle:
+                handle.write(header + "".join(carried))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(temp_name, self._path.stat().st_mode if self._path.exists() else 0o644)
+            # Windows cannot replace a file that is still open, so both journals are
+            # closed first. If the journal was closed meanwhile, the new one still
+            # covers the carried records.
+            reopen = self._handle is not None
+            if reopen:
+                self._handle.close()
+                self._handle = None
+            os.replace(temp_name, self._path)
+            if reopen:
+                self._handle = self._path.open("a", encoding="utf-8")
+
+    def checkpoint(self) -> None:
+        """Fold the journal into a new snapshot and start an empty journal."""
+        self.wait()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        file_format = DataManager.detect_format(self._snapshot_path)
+        DataManager.save(self._institute, self._snapshot_path, file_format=file_format)
+        # A crash before the new header lands leaves a journal whose stamp no longer
+        # matches the snapshot, so it is ignored on replay.
+        self._start()
+
+    def _start(self) -> None:
+        """Start an empty journal stamped with the snapshot as it is on disk."""
+        handle = self._path.open("w", encoding="utf-8")
+        try:
+            handle.write(json.dumps(DataManager._log_header(self._snapshot_path)) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        except BaseException:
+            handle.close()
+            raise
+        self._handle = handle
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync outstanding records and stop journaling."""
+        self.wait()
+        if self._handle is None:
+            return
+        self._institute.remove_listener(self._record)
+        self.sync()
+        with self._lock:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,330 @@
+"""Incremental JSON reading and writing for institute documents.
+
+The reader pulls the file in chunks and exposes objects and arrays as iterators,
+so the loader can build entities as each subtree completes instead of holding
+the raw text and the full dictionary tree in memory. The writer emits the same
+layout as ``json.dumps`` one student at a time.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO, TypeVar
+
+from .course import Course
+from .department import Department
+from .faculty import Faculty
+from .group import Group
+from .institute import Institute
+from .student import Student
+from .university_entity import ID_KEY, REF_KEY, Node, References, shared_marker
+
+N = TypeVar("N", bound=Node)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+# Skips text that cannot change the bracket depth: anything but brackets and
+# quotes, whole strings, and objects or arrays with nothing nested inside.
+_STRING = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+_FLAT = r'(?:[^"{}\[\]]++|' + _STRING + r')*+'
+_SKIP = re.compile(
+    r'(?:[^"{}\[\]]++|' + _STRING + r'|\{' + _FLAT + r'\}|\[' + _FLAT + r'\])*+', re.DOTALL
+)
+
+
+class JsonStreamReader:
+    """Pull-based reader over a text stream containing a JSON document."""
+
+    def __init__(self, handle: TextIO, chunk_size: int = 1 << 16) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text first."""
+        if self._eof:
+            return False
+        chunk = self._handle.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it, or '' at EOF."""
+        while True:
+            buffer = self._buffer
+            pos = _WHITESPACE.match(buffer, self._pos).end()
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _scan(self) -> tuple[Any, int]:
+        """Decode the next value without consuming it; return it with its end offset.
+
+        Refills only drop text before ``self._pos``, so the value still starts there.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut at the buffer edge, even inside its fraction or exponent
+            # ("12." or "1e"), may continue in the next chunk.
+            if _NUMBER_TAIL.match(self._buffer, end) and self._fill():
+                continue
+            return value, end
+
+    def read_value(self) -> Any:
+        """Decode and return the next complete JSON value."""
+        value, self._pos = self._scan()
+        return value
+
+    def _skip(self) -> int:
+        """Return the end offset of the object or array starting at ``self._pos``.
+
+        Only brackets outside strings are counted; the contents are left for the
+        caller to decode and validate.
+        """
+        # Step inside first: ``_SKIP`` would swallow a flat value whole.
+        depth = 1
+        index = self._pos + 1
+        while True:
+            index = _SKIP.match(self._buffer, index).end()  # type: ignore[union-attr]
+            if index < len(self._buffer):
+                char = self._buffer[index]
+                # A quote left over starts a string that runs past the buffer.
+                if char != '"':
+                    depth += 1 if char in "{[" else -1
+                    index += 1
+                    if not depth:
+                        return index
+                    continue
+            # Refills drop the text before ``self._pos``, so keep the offset relative.
+            consumed = index - self._pos
+            if not self._fill():
+                raise self._error("Unterminated value")
+            index = self._pos + consumed
+
+    def read_raw(self) -> str:
+        """Return the source text of the next complete JSON value.
+
+        Objects and arrays are delimited without being decoded.
+        """
+        if self.peek() in ("{", "["):
+            end = self._skip()
+        else:
+            _, end = self._scan()
+        raw = self._buffer[self._pos : end]
+        self._pos = end
+        return raw
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the next object; the caller must consume each value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per element of the next array; the caller must consume each element."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def expect_end(self) -> None:
+        """Raise if anything other than whitespace follows the document."""
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def _resolved(cls: type[N], fields: dict[str, Any], refs: dict[str, Any], build: Callable[[], N]) -> N:
+    """Return the node an ``$ref`` object names, or build one and record its ``$id``."""
+    if REF_KEY in fields:
+        return cls._resolve(fields[REF_KEY], refs)
+    node = build()
+    if ID_KEY in fields:
+        refs[str(fields[ID_KEY])] = node
+    return node
+
+
+def _read_group(reader: JsonStreamReader, refs: dict[str, Any]) -> Group:
+    fields: dict[str, Any] = {}
+    students: list[Student] = []
+    for key in reader.iter_object():
+        if key == "students":
+            students = [Student._load(reader.read_value(), refs) for _ in reader.iter_array()]
+        else:
+            fields[key] = reader.read_value()
+    return _resolved(Group, fields, refs, lambda: Group(name=str(fields["name"]), students=students))
+
+
+def _read_department(reader: JsonStreamReader, refs: dict[str, Any]) -> Department:
+    fields: dict[str, Any] = {}
+    groups: list[Group] = []
+    for key in reader.iter_object():
+        if key == "groups":
+            groups = [_read_group(reader, refs) for _ in reader.iter_array()]
+        else:
+            fields[key] = reader.read_value()
+    return _resolved(Department, fields, refs, lambda: Department(name=str(fields["name"]), groups=groups))
+
+
+def _read_faculty(reader: JsonStreamReader, refs: dict[str, Any]) -> Faculty:
+    fields: dict[str, Any] = {}
+    departments: list[Department] = []
+    for key in reader.iter_object():
+        if key == "departments":
+            departments = [_read_department(reader, refs) for _ in reader.iter_array()]
+        else:
+            fields[key] = reader.read_value()
+    return _resolved(Faculty, fields, refs, lambda: Faculty(name=str(fields["name"]), departments=departments))
+
+
+def _read_course(reader: JsonStreamReader, refs: dict[str, Any]) -> Course:
+    fields: dict[str, Any] = {}
+    faculties: list[Faculty] = []
+    for key in reader.iter_object():
+        if key == "faculties":
+            faculties = [_read_faculty(reader, refs) for _ in reader.iter_array()]
+        else:
+            fields[key] = reader.read_value()
+    return _resolved(Course, fields, refs, lambda: Course(number=int(fields["number"]), faculties=faculties))
+
+
+def read_institute(handle: TextIO) -> Institute:
+    """Build an institute from a JSON stream, equivalent to ``Institute.from_dict``."""
+    reader = JsonStreamReader(handle)
+    if reader.peek() != "{":
+        raise ValueError("Serialized institute data must be a JSON object")
+    fields: dict[str, Any] = {}
+    courses: list[Course] = []
+    refs: dict[str, Any] = {}
+    for key in reader.iter_object():
+        if key == "courses":
+            courses = [_read_course(reader, refs) for _ in reader.iter_array()]
+        else:
+            fields[key] = reader.read_value()
+    reader.expect_end()
+    return Institute(name=str(fields["name"]), courses=courses)
+
+
+class JsonStreamWriter:
+    """Write institute entities to a text stream without building the full tree.
+
+    With an integer ``indent`` the output matches ``json.dumps(data, indent=indent)``;
+    with ``None`` it is written compactly without any whitespace. ``references``
+    selects the layout of ``Institute.to_dict(references=True)``.
+    """
+
+    def __init__(self, handle: TextIO, indent: Optional[int] = 2, references: bool = False) -> None:
+        self._write = handle.write
+        self._references = references
+        self._refs: Optional[References] = None
+        self._indent = indent
+        self._item_separator = ","
+        self._key_separator = ": " if indent is not None else ":"
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def _newline(self, level: int) -> str:
+        if self._indent is None:
+            return ""
+        return "\n" + " " * (self._indent * level)
+
+    def _member(self, level: int, key: str, value: object) -> str:
+        return self._newline(level + 1) + self._encode(key) + self._key_separator + self._encode(value)
+
+    def _write_node(
+        self,
+        level: int,
+        fields: Iterable[tuple[str, object]],
+        children_key: str,
+        children: Iterable[N],
+        write_child: Callable[[N, int, list[tuple[str, str]]], None],
+    ) -> None:
+        separator = self._item_separator
+        self._write("{")
+        for key, value in fields:
+            self._write(self._member(level, key, value) + separator)
+        self._write(self._newline(level + 1) + self._encode(children_key) + self._key_separator + "[")
+        empty = True
+        for child in children:
+            self._write(("" if empty else separator) + self._newline(level + 2))
+            marker = shared_marker(child, self._refs)
+            if marker is None:
+                write_child(child, level + 2, [])
+            elif marker[0] == REF_KEY:
+                self._write("{" + self._member(level + 2, *marker) + self._newline(level + 2) + "}")
+            else:
+                write_child(child, level + 2, [marker])
+            empty = False
+        self._write(("" if empty else self._newline(level + 1)) + "]")
+        self._write(self._newline(level) + "}")
+
+    def _write_student(self, student: Student, level: int, head: list[tuple[str, str]]) -> None:
+        fields = [*head, *student.to_dict().items()]
+        members = (self._member(level, key, value) for key, value in fields)
+        self._write("{" + self._item_separator.join(members) + self._newline(level) + "}")
+
+    def _write_group(self, group: Group, level: int, head: list[tuple[str, str]]) -> None:
+        self._write_node(level, [*head, ("name", group.name)], "students", group.students, self._write_student)
+
+    def _write_department(self, department: Department, level: int, head: list[tuple[str, str]]) -> None:
+        self._write_node(
+            level, [*head, ("name", department.name)], "groups", department.groups, self._write_group
+        )
+
+    def _write_faculty(self, faculty: Faculty, level: int, head: list[tuple[str, str]]) -> None:
+        self._write_node(
+            level, [*head, ("name", faculty.name)], "departments", faculty.departments, self._write_department
+        )
+
+    def _write_course(self, course: Course, level: int, head: list[tuple[str, str]]) -> None:
+        self._write_node(
+            level, [*head, ("number", course.number)], "faculties", course.faculties, self._write_faculty
+        )
+
+    def write_institute(self, institute: Institute) -> None:
+        """Write the institute as a JSON document equivalent to ``Institute.to_dict``
+        (with ``references`` as given to the writer)."""
+        self._refs = References(institute) if self._references else None
+        self._write_node(0, [("name", institute.name)], "courses", institute.courses, self._write_course)
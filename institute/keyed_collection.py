@@ -0,0 +1,71 @@
+"""Insertion-ordered keyed container used by the entity classes."""
+from __future__ import annotations
+
+from typing import Generic, Iterator, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class KeyedCollection(Generic[K, V]):
+    """Hold child entities by key while preserving insertion order.
+
+    Lookups, duplicate checks and removals are O(1). Every key also gets a
+    monotonically increasing position, so the relative order of two children can
+    be compared without scanning the collection.
+
+    A tuple snapshot of the values is cached and reused until the next mutation,
+    tracked through a version counter.
+    """
+
+    __slots__ = ("_items", "_positions", "_next_position", "_version", "_snapshot", "_snapshot_version")
+
+    def __init__(self) -> None:
+        self._items: dict[K, V] = {}
+        self._positions: dict[K, int] = {}
+        self._next_position = 0
+        self._version = 0
+        self._snapshot: tuple[V, ...] = ()
+        self._snapshot_version = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[V]:
+        return iter(self._items.values())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def get(self, key: K) -> Optional[V]:
+        return self._items.get(key)
+
+    def add(self, key: K, value: V) -> None:
+        """Append a value under a key that is not present yet."""
+        self._items[key] = value
+        self._positions[key] = self._next_position
+        self._next_position += 1
+        self._version += 1
+
+    def pop(self, key: K) -> V:
+        """Remove and return the value stored under ``key``; raise ``KeyError`` if absent."""
+        value = self._items.pop(key)
+        del self._positions[key]
+        self._version += 1
+        return value
+
+    def position(self, key: K) -> int:
+        """Return a sort key reflecting the insertion order of ``key``."""
+        return self._positions[key]
+
+    @property
+    def version(self) -> int:
+        """Return a counter incremented on every mutation."""
+        return self._version
+
+    def snapshot(self) -> tuple[V, ...]:
+        """Return the values as a tuple, reusing the cached one while unchanged."""
+        if self._snapshot_version != self._version:
+            self._snapshot = tuple(self._items.values())
+            self._snapshot_version = self._version
+        return self._snapshot
@@ -1,19 +1,26 @@
 """Console interface for managing an institute."""
 from __future__ import annotations
 
+import argparse
 import json
+import sys
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
+from .batch import run_batch
 from .course import Course
-from .data_manager import DataManager
+from .data_manager import DEFAULT_DATA_FILE, DataManager
 from .department import Department
 from .faculty import Faculty
 from .group import Group
 from .institute import Institute
+from .journal import Journal
 from .student import Student
 
-DEFAULT_DATA_FILE = Path("institute_data.json")
+# Saves still being written in the background, with the file each one targets.
+PendingSaves = list[tuple[Path, Future[None]]]
 
 
 def prompt_non_empty(message: str, allow_default: bool = False, default: str = "") -> str:
@@ -43,62 +50,82 @@ def prompt_float(message: str) -> float:
             print("Please enter a valid number.")
 
 
-def choose_course(institute: Institute) -> Optional[Course]:
+# Child kind, plural and parent kind at each level below the course.
+_DRILL_DOWN = (
+    ("faculty", "faculties", "course"),
+    ("department", "departments", "faculty"),
+    ("group", "groups", "department"),
+)
+PATH_PARTS = ("course", "faculty", "department", "group")
+
+
+def choose_path(institute: Institute, depth: int) -> Optional[tuple[Any, ...]]:
+    """Prompt for the entities from a course down to ``depth`` levels (1-4).
+
+    Below the course level the first prompt also accepts a whole path, such as
+    ``3/Science/Mathematics/Group A``, which ``Institute.resolve`` looks up in one
+    step; otherwise each level is asked for in turn.
+    """
     if not institute.courses:
         print("No courses available. Please add a course first.")
         return None
-    number = prompt_int("Enter course number: ")
+    prompt = "Enter course number or path: " if depth > 1 else "Enter course number: "
+    while True:
+        raw = prompt_non_empty(prompt)
+        if depth > 1 and "/" in raw:
+            return resolve_path(institute, raw, depth)
+        try:
+            number = int(raw)
+            break
+        except ValueError:
+            print("Please enter a valid integer.")
     course = institute.find_course(number)
     if not course:
         print(f"Course {number} not found.")
-    return course
-
-
-def choose_faculty(institute: Institute) -> Optional[tuple[Course, Faculty]]:
-    course = choose_course(institute)
-    if not course:
         return None
-    if not course.faculties:
-        print("No faculties in this course. Please add one first.")
+    path: list[Any] = [course]
+    for kind, plural, parent_kind in _DRILL_DOWN[: depth - 1]:
+        parent = path[-1]
+        parent_label = f"course {parent.number}" if parent_kind == "course" else f"{parent_kind} {parent.name}"
+        if not parent._children():
+            print(f"No {plural} in this {parent_kind}. Please add one first.")
+            return None
+        name = prompt_non_empty(f"Enter {kind} name: ")
+        child = parent._child_collection().get(name)
+        if not child:
+            print(f"{kind.capitalize()} '{name}' not found in {parent_label}.")
+            return None
+        path.append(child)
+    return tuple(path)
+
+
+def resolve_path(institute: Institute, raw: str, depth: int) -> Optional[tuple[Any, ...]]:
+    try:
+        path = institute.resolve(raw)
+    except ValueError as exc:
+        print(exc)
         return None
-    faculty_name = prompt_non_empty("Enter faculty name: ")
-    faculty = course.find_faculty(faculty_name)
-    if not faculty:
-        print(f"Faculty '{faculty_name}' not found in course {course.number}.")
+    if len(path) != depth:
+        print(f"Expected a path of the form {'/'.join(PATH_PARTS[:depth])}.")
         return None
-    return course, faculty
+    return path
+
+
+def choose_course(institute: Institute) -> Optional[Course]:
+    path = choose_path(institute, 1)
+    return path[0] if path else None
+
+
+def choose_faculty(institute: Institute) -> Optional[tuple[Course, Faculty]]:
+    return choose_path(institute, 2)  # type: ignore[return-value]
 
 
 def choose_department(institute: Institute) -> Optional[tuple[Course, Faculty, Department]]:
-    faculty_path = choose_faculty(institute)
-    if not faculty_path:
-        return None
-    course, faculty = faculty_path
-    if not faculty.departments:
-        print("No departments in this faculty. Please add one first.")
-        return None
-    department_name = prompt_non_empty("Enter department name: ")
-    department = faculty.find_department(department_name)
-    if not department:
-        print(f"Department '{department_name}' not found in faculty {faculty.name}.")
-        return None
-    return course, faculty, department
+    return choose_path(institute, 3)  # type: ignore[return-value]
 
 
 def choose_group(institute: Institute) -> Optional[tuple[Course, Faculty, Department, Group]]:
-    department_path = choose_department(institute)
-    if not department_path:
-        return None
-    course, faculty, department = department_path
-    if not department.groups:
-        print("No groups in this department. Please add one first.")
-        return None
-    group_name = prompt_non_empty("Enter group name: ")
-    group = department.find_group(group_name)
-    if not group:
-        print(f"Group '{group_name}' not found in department {department.name}.")
-        return None
-    return course, faculty, department, group
+    return choose_path(institute, 4)  # type: ignore[return-value]
 
 
 def add_course(institute: Institute) -> None:
@@ -343,19 +370,53 @@ def resolve_file_path(default_path: Path) -> Path:
     return Path(raw) if raw else default_path
 
 
-def save_data(institute: Institute, default_path: Path = DEFAULT_DATA_FILE) -> None:
+def save_data(
+    institute: Institute,
+    default_path: Path = DEFAULT_DATA_FILE,
+    journal: Optional[Journal] = None,
+    pending: Optional[PendingSaves] = None,
+) -> None:
+    """Save to a prompted path; with ``pending`` the file is written in the background.
+
+    The institute is copied before this returns, so editing can go on while the
+    save runs; ``report_saves`` announces the outcome later.
+    """
     path = resolve_file_path(default_path)
     try:
-        DataManager.save(institute, path)
-        print(f"Data saved to {path}.")
+        if journal is not None and path.resolve() == journal.snapshot_path.resolve():
+            future = journal.checkpoint_background()
+        else:
+            future = DataManager.save_background(institute, path)
     except OSError as exc:
         print(f"Failed to save data: {exc}")
+        return
+    if pending is None:
+        pending = [(path, future)]
+        report_saves(pending, block=True)
+        return
+    pending.append((path, future))
+    print(f"Saving data to {path} in the background.")
+
+
+def report_saves(pending: PendingSaves, block: bool = False) -> None:
+    """Print the outcome of finished background saves and drop them from ``pending``."""
+    still_running: PendingSaves = []
+    for path, future in pending:
+        if not block and not future.done():
+            still_running.append((path, future))
+            continue
+        error = future.exception()
+        if error is None:
+            print(f"Data saved to {path}.")
+        else:
+            print(f"Failed to save data to {path}: {error}")
+    pending[:] = still_running
 
 
 def load_data(default_path: Path = DEFAULT_DATA_FILE) -> Optional[Institute]:
     path = resolve_file_path(default_path)
     try:
-        institute = DataManager.load(path)
+        institute = DataManager.load(path, lazy=True)
         print(f"Loaded institute '{institute.name}' from {path}.")
         return institute
     except FileNotFoundError:
@@ -367,21 +428,42 @@ def load_data(default_path: Path = DEFAULT_DATA_FILE) -> Optional[Institute]:
     return None
 
 
-def load_data_action(_: Institute) -> Optional[Institute]:
+def load_data_action(_: Institute, default_path: Path = DEFAULT_DATA_FILE) -> Optional[Institute]:
     """Prompt for a file path and return the loaded institute if successful."""
-    return load_data(DEFAULT_DATA_FILE)
+    return load_data(default_path)
 
 
-def load_initial_institute(default_path: Path) -> Institute:
+def load_initial_institute(default_path: Path) -> tuple[Institute, Optional[Journal]]:
+    """Load the data file and replay its journal, then keep journaling further edits.
+
+    No journal is started when an existing data file fails to load, so it is never
+    overwritten by a checkpoint of the empty replacement institute. A journal that
+    cannot be opened only leaves further edits unjournaled.
+    """
     if default_path.exists():
         try:
-            institute = DataManager.load(default_path)
+            institute = DataManager.load(default_path, lazy=True)
             print(f"Loaded institute '{institute.name}' from {default_path}.")
-            return institute
+            recovered = Journal.replay(institute, default_path)
+            if recovered:
+                print(f"Recovered {recovered} unsaved changes from the journal.")
         except (json.JSONDecodeError, OSError, ValueError) as exc:
             print(f"Could not load existing data: {exc}")
-    name = input("Enter institute name [My Institute]: ").strip() or "My Institute"
-    return Institute(name)
+            name = input("Enter institute name [My Institute]: ").strip() or "My Institute"
+            return Institute(name), None
+    else:
+        name = input("Enter institute name [My Institute]: ").strip() or "My Institute"
+        institute = Institute(name)
+    return institute, start_journal(default_path, institute)
+
+
+def start_journal(default_path: Path, institute: Institute) -> Optional[Journal]:
+    """Return a journal for ``institute``, or ``None`` with a warning if it cannot be opened."""
+    try:
+        return Journal(default_path, institute)
+    except OSError as exc:
+        print(f"Warning: could not open the journal, so changes are kept only until saved: {exc}")
+        return None
 
 
 def wrap_action(action: Callable[[Institute], None]) -> Callable[[Institute], Optional[Institute]]:
@@ -392,8 +474,62 @@ def wrap_action(action: Callable[[Institute], None]) -> Callable[[Institute], Op
     return wrapper
 
 
-def main() -> None:
-    institute = load_initial_institute(DEFAULT_DATA_FILE)
+def run_batch_file(ops_path: Path, data_path: Path, name: str, commit_every: int) -> int:
+    """Apply a batch file to the data file without prompts; return the exit status.
+
+    Edits are journaled and synced every ``commit_every`` operations, and the data
+    file is rewritten once at the end.
+    """
+    try:
+        if data_path.exists():
+            institute = DataManager.load(data_path, lazy=True)
+            Journal.replay(institute, data_path)
+        else:
+            institute = Institute(name)
+        journal = Journal(data_path, institute, sync_every=commit_every, sync_interval=float("inf"))
+    except (OSError, ValueError) as exc:
+        print(f"Could not load {data_path}: {exc}", file=sys.stderr)
+        return 1
+    saves: list[Future[None]] = []
+
+    def save(path: Optional[str]) -> None:
+        if path is None:
+            saves.append(journal.checkpoint_background())
+        else:
+            saves.append(DataManager.save_background(institute, Path(path)))
+
+    try:
+        with ops_path.open(encoding="utf-8") as handle:
+            report = run_batch(institute, handle, save, sys.stdout, sys.stderr)
+        started = time.perf_counter()
+        journal.checkpoint()
+        saved_in = time.perf_counter() - started
+    finally:
+        journal.close()
+    failed_saves = [error for error in (future.exception() for future in saves) if error is not None]
+    for error in failed_saves:
+        print(f"Failed to save data: {error}", file=sys.stderr)
+    print(
+        f"{report.operations} operations ({report.failed} failed) in {report.seconds:.2f} s: "
+        f"{report.rate:,.0f} ops/sec; saved {data_path} in {saved_in:.2f} s."
+    )
+    return 1 if report.failed or failed_saves else 0
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage an institute interactively or from a batch file.")
+    parser.add_argument("--batch", type=Path, help="run the JSON-lines operations in this file and exit")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_FILE, help="data file to load and save")
+    parser.add_argument("--name", default="My Institute", help="institute name if the data file is new")
+    parser.add_argument(
+        "--commit-every", type=int, default=1000, help="journal sync interval in batch mode, in operations"
+    )
+    args = parser.parse_args(argv)
+    if args.batch is not None:
+        raise SystemExit(run_batch_file(args.batch, args.data, args.name, args.commit_every))
+
+    institute, journal = load_initial_institute(args.data)
+    pending_saves: PendingSaves = []
 
     actions: dict[str, Callable[[Institute], Optional[Institute]]] = {
         "1": wrap_action(add_course),
@@ -409,11 +545,12 @@ def main() -> None:
         "11": wrap_action(show_structure),
         "12": wrap_action(search_menu),
         "13": wrap_action(edit_student_grade),
-        "14": wrap_action(save_data),
-        "15": load_data_action,
+        "14": wrap_action(lambda current: save_data(current, args.data, journal, pending_saves)),
+        "15": lambda current: load_data_action(current, args.data),
     }
 
     while True:
+        report_saves(pending_saves)
         print("\nInstitute Management Menu")
         print("-------------------------")
         print(" 1. Add course")
@@ -434,6 +571,9 @@ def main() -> None:
         print(" 0. Exit")
         choice = input("Select an option: ").strip()
         if choice == "0":
+            report_saves(pending_saves, block=True)
+            if journal is not None:
+                journal.close()
             print("Goodbye!")
             break
         action = actions.get(choice)
@@ -443,6 +583,11 @@ def main() -> None:
         result = action(institute)
         if isinstance(result, Institute) and result is not institute:
             institute = result
+            if journal is not None:
+                # The journal extends the --data file, not the newly loaded one.
+                journal.close()
+                journal = None
+                print("Journaling stopped; use 'Save data' to keep further changes.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""Multi-process loading of JSON institute files.
+
+The parent streams the document and cuts it at faculty boundaries, found by
+matching brackets rather than decoding the text. Worker
+processes parse and validate each faculty with ``Faculty.from_dict`` and send it
+back in the compact binary snapshot encoding. Python objects cannot cross
+process boundaries any cheaper than they can be built, so the parent still
+creates every entity, but from flat arrays with the parsing and validation
+already done.
+
+Faculties that take part in ``$id``/``$ref`` sharing are built in the parent, in
+document order, so references resolve exactly as in the serial loader.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from .binary_format import BinaryReader, BinaryWriter
+from .course import Course
+from .faculty import Faculty
+from .institute import Institute
+from .json_stream import JsonStreamReader
+from .university_entity import ID_KEY, REF_KEY
+
+# Faculties handed to the pool ahead of the one being decoded, per worker.
+_QUEUE_DEPTH = 4
+
+
+def _encode_faculty(text: str) -> bytes:
+    """Worker side: build one faculty from its JSON text and encode it."""
+    faculty = Faculty.from_dict(json.loads(text))
+    buffer = io.BytesIO()
+    # The snapshot format frames everything in an institute; the wrappers are
+    # dropped again by ``_decode_faculty``.
+    BinaryWriter(buffer).write_institute(Institute("part", [Course(1, [faculty])]))
+    return buffer.getvalue()
+
+
+def _decode_faculty(blob: bytes) -> Faculty:
+    # The worker validated every student while building the faculty.
+    _, (course,) = BinaryReader(blob, validated=True).read_courses()
+    (faculty,) = course.faculties
+    course.remove_faculty(faculty.name)
+    return faculty
+
+
+def load_parallel(path: Path, workers: Optional[int] = None) -> Institute:
+    """Load a JSON institute file using ``workers`` processes (default: one per CPU).
+
+    Produces the same entities, in the same order, as ``Institute.from_dict``.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError("workers must be at least 1")
+    course_specs: list[tuple[dict[str, Any], list[Faculty]]] = []
+    fields: dict[str, Any] = {}
+    pending: deque[tuple[list[Faculty], Future[bytes]]] = deque()
+    refs: dict[str, Any] = {}
+
+    def drain(limit: int) -> None:
+        while len(pending) > limit:
+            faculties, future = pending.popleft()
+            faculties.append(_decode_faculty(future.result()))
+
+    with path.open(encoding="utf-8") as handle, ProcessPoolExecutor(max_workers=workers) as executor:
+        reader = JsonStreamReader(handle)
+        if reader.peek() != "{":
+            raise ValueError("Serialized institute data must be a JSON object")
+        for key in reader.iter_object():
+            if key != "courses":
+                fields[key] = reader.read_value()
+                continue
+            for _ in reader.iter_array():
+                course_fields: dict[str, Any] = {}
+                faculties: list[Faculty] = []
+                for course_key in reader.iter_object():
+                    if course_key != "faculties":
+                        course_fields[course_key] = reader.read_value()
+                        continue
+                    for _ in reader.iter_array():
+                        text = reader.read_raw()
+                        if f'"{ID_KEY}"' in text or f'"{REF_KEY}"' in text:
+                            drain(0)
+                            faculties.append(Faculty._load(json.loads(text), refs))
+                            continue
+                        pending.append((faculties, executor.submit(_encode_faculty, text)))
+                        drain(workers * _QUEUE_DEPTH)
+                course_specs.append((course_fields, faculties))
+        reader.expect_end()
+        drain(0)
+    courses = [Course(number=int(spec["number"]), faculties=faculties) for spec, faculties in course_specs]
+    return Institute(name=str(fields["name"]), courses=courses)
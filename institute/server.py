@@ -0,0 +1,184 @@
+"""Read-only query server over a local socket.
+
+The institute is loaded once and shared by every client. Each request is one
+line, ``COMMAND [argument]``, answered by one JSON line:
+``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``.
+Connections stay open for any number of requests until the client closes them
+or sends ``QUIT``.
+
+    ID S001                   find_student_by_id
+    NAME ali                  find_students_by_name
+    GROUP Group A             find_group
+    DEPARTMENT Mathematics    find_department
+    STATS [path]              grade_stats of the institute or of a resolve path
+
+Entities are reported by their ``Institute.resolve`` paths. Encoded answers are
+kept in an LRU cache that is emptied whenever the institute changes.
+
+Run ``python -m institute.server --data FILE`` to serve on ``127.0.0.1:8765``,
+or pass ``--socket PATH`` for a Unix domain socket.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .data_manager import DEFAULT_DATA_FILE, DataManager
+from .institute import Institute, format_path
+from .journal import Journal
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 4096
+
+
+class QueryServer:
+    """Answer protocol lines against one institute."""
+
+    def __init__(self, institute: Institute, cache_size: int = CACHE_SIZE) -> None:
+        self._institute = institute
+        self._commands: dict[str, Callable[[str], Any]] = {
+            "ID": self._student_by_id,
+            "NAME": self._students_by_name,
+            "GROUP": self._group,
+            "DEPARTMENT": self._department,
+            "STATS": self._stats,
+        }
+        self.answer = lru_cache(maxsize=cache_size)(self._answer)
+        institute.add_listener(self._invalidate)
+
+    def _invalidate(self, event: str, path: tuple[Any, ...], *args: object) -> None:
+        # Decoding a lazily loaded group changes no answer.
+        if event != "load":
+            self.answer.cache_clear()
+
+    def close(self) -> None:
+        """Stop following changes to the institute."""
+        self._institute.remove_listener(self._invalidate)
+
+    def _answer(self, line: str) -> bytes:
+        """Return the encoded response to a request line without its line break."""
+        command, _, argument = line.partition(" ")
+        handler = self._commands.get(command.upper())
+        try:
+            if handler is None:
+                raise ValueError(f"unknown command {command!r}; expected one of {tuple(self._commands)}")
+            response: dict[str, Any] = {"ok": True, "result": handler(argument.strip())}
+        except (TypeError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+        return json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+    def _student_by_id(self, student_id: str) -> Optional[dict[str, Any]]:
+        path = self._institute.find_student_by_id(_required(student_id))
+        return {"path": format_path(path), "student": path[-1].to_dict()} if path else None
+
+    def _students_by_name(self, fragment: str) -> list[dict[str, Any]]:
+        return [
+            {"path": format_path(path), "student": path[-1].to_dict()}
+            for path in self._institute.find_students_by_name(_required(fragment))
+        ]
+
+    def _group(self, name: str) -> Optional[str]:
+        path = self._institute.find_group(_required(name))
+        return format_path(path) if path else None
+
+    def _department(self, name: str) -> Optional[str]:
+        path = self._institute.find_department(_required(name))
+        return format_path(path) if path else None
+
+    def _stats(self, path: str) -> dict[str, Any]:
+        entity = self._institute.resolve(path)[-1] if path else self._institute
+        stats = entity.grade_stats()
+        return {**asdict(stats), "mean": stats.mean}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line or line.strip().upper() == b"QUIT":
+                    break
+                writer.write(self.answer(line.decode("utf-8", errors="replace").strip()))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, socket_path: Optional[Path] = None
+    ) -> asyncio.AbstractServer:
+        """Start listening on ``host:port``, or on a Unix socket at ``socket_path``."""
+        if socket_path is not None:
+            return await asyncio.start_unix_server(self._serve_connection, path=socket_path)
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+
+def _required(argument: str) -> str:
+    if not argument:
+        raise ValueError("missing argument")
+    return argument
+
+
+class QueryClient:
+    """Keep one connection to a ``QueryServer`` open and send requests over it."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(
+        cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT, socket_path: Optional[Path] = None
+    ) -> "QueryClient":
+        if socket_path is not None:
+            return cls(*await asyncio.open_unix_connection(socket_path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def query(self, command: str, argument: str = "") -> Any:
+        """Send one request and return its result; a server-side error raises ``ValueError``."""
+        line = f"{command} {argument}".strip()
+        if "\n" in line:
+            raise ValueError("requests cannot contain line breaks")
+        self._writer.write(line.encode() + b"\n")
+        await self._writer.drain()
+        response = json.loads(await self._reader.readline())
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return response["result"]
+
+    async def close(self) -> None:
+        self._writer.write(b"QUIT\n")
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    institute = DataManager.load(args.data, lazy=True)
+    Journal.replay(institute, args.data)
+    server = await QueryServer(institute, args.cache_size).start(args.host, args.port, args.socket)
+    where = args.socket or f"{args.host}:{args.port}"
+    print(f"Serving '{institute.name}' from {args.data} on {where}.")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve read-only institute queries over a local socket.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_FILE)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", type=Path, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 """Student entity definition."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 
+from .university_entity import Node
 
-@dataclass
-class Student:
-    """Represent a student within the institute."""
+
+@dataclass(slots=True)
+class Student(Node):
+    """Represent a student within the institute.
+
+    Slotted, with interned names, to keep the per-student footprint small.
+    """
 
     first_name: str
     last_name: str
@@ -21,12 +27,40 @@ class Student:
         if not self.student_id or not self.student_id.strip():
             raise ValueError("student_id cannot be empty")
         self._validate_grade(self.average_grade)
+        self.first_name = sys.intern(self.first_name)
+        self.last_name = sys.intern(self.last_name)
+        self._parents = ()
+
+    @classmethod
+    def _unchecked(cls, first_name: str, last_name: str, student_id: str, average_grade: float) -> "Student":
+        """Build a student from fields the caller already validated, skipping ``__post_init__``."""
+        student = object.__new__(cls)
+        student.first_name = sys.intern(first_name)
+        student.last_name = sys.intern(last_name)
+        student.student_id = student_id
+        student.average_grade = average_grade
+        student._parents = ()
+        return student
+
+    def __getstate__(self) -> tuple[str, str, str, float]:
+        # The groups holding the student stay behind; a copy starts detached.
+        return self.first_name, self.last_name, self.student_id, self.average_grade
+
+    def __setstate__(self, state: tuple[str, str, str, float]) -> None:
+        first_name, last_name, self.student_id, self.average_grade = state
+        self.first_name = sys.intern(first_name)
+        self.last_name = sys.intern(last_name)
+        self._parents = ()
 
     @staticmethod
     def _validate_grade(value: float) -> None:
         if not (0.0 <= value <= 100.0):
             raise ValueError("average_grade must be between 0 and 100")
 
+    @property
+    def _key(self) -> str:
+        return self.student_id
+
     @property
     def full_name(self) -> str:
         """Return the student's full name."""
@@ -35,7 +69,22 @@ class Student:
     def update_average_grade(self, new_grade: float) -> None:
         """Update the student's average grade with validation."""
         self._validate_grade(new_grade)
+        old_grade = self.average_grade
         self.average_grade = new_grade
+        for group in self._parents:
+            group._propagate("grade", (self,), old_grade)
+
+    def rename(self, first_name: str, last_name: str) -> None:
+        """Change the student's name, keeping the institute's name index current."""
+        if not first_name or not first_name.strip():
+            raise ValueError("first_name cannot be empty")
+        if not last_name or not last_name.strip():
+            raise ValueError("last_name cannot be empty")
+        old_name = self.full_name
+        self.first_name = sys.intern(first_name)
+        self.last_name = sys.intern(last_name)
+        for group in self._parents:
+            group._propagate("rename", (self,), old_name)
 
     def to_dict(self) -> dict[str, object]:
         """Serialize the student to a JSON-compatible dictionary."""
@@ -1,24 +1,287 @@
 """Base class for university entities."""
 from __future__ import annotations
 
+import sys
 from abc import ABC
+from typing import Any, Iterable, Optional
 
+from .grade_stats import GradeStats, GradeTotals
 
-class UniversityEntity(ABC):
+# Keys marking the first copy of an entity that has several parents and the
+# references written in place of its later copies.
+ID_KEY = "$id"
+REF_KEY = "$ref"
+
+
+class References:
+    """The IDs given to shared nodes while one document is written.
+
+    Only nodes reached along several routes from the root of the document are
+    shared in it; a parent outside the document, such as one detached since,
+    does not count, so every ``$id`` written has a ``$ref`` to match.
+    """
+
+    __slots__ = ("_repeated", "_ids")
+
+    def __init__(self, root: Any) -> None:
+        self._repeated = _repeated_nodes(root)
+        self._ids: dict[int, str] = {}
+
+
+def _repeated_nodes(root: Any) -> set[int]:
+    """Return the ``id`` of each node found more than once below a live or frozen ``root``.
+
+    A repeated node is not walked again, as the writers refer to it instead.
+    """
+    seen: set[int] = set()
+    repeated: set[int] = set()
+    level = [root]
+    while level:
+        below = []
+        for node in level:
+            children = node._children
+            for child in children() if callable(children) else children:
+                # Only a node with several parents can be reached twice.
+                if len(child._parents) > 1:
+                    if id(child) in seen:
+                        repeated.add(id(child))
+                        continue
+                    seen.add(id(child))
+                below.append(child)
+        # Students hold nothing, so the walk stops above them.
+        level = below if below and hasattr(below[0], "_children") else []
+    return repeated
+
+
+def shared_marker(node: "Node", refs: Optional[References]) -> Optional[tuple[str, str]]:
+    """Return ``(ID_KEY, id)`` for the first copy of a shared node, ``(REF_KEY, id)`` for
+    later ones and ``None`` for nodes written in full without an ID."""
+    if refs is None or id(node) not in refs._repeated:
+        return None
+    ref = refs._ids.get(id(node))
+    if ref is not None:
+        return REF_KEY, ref
+    ref = refs._ids[id(node)] = str(len(refs._ids) + 1)
+    return ID_KEY, ref
+
+
+class Node:
+    """Bookkeeping shared by everything that can be held by a university entity."""
+
+    # ``_parents`` is a tuple rather than a list: nearly every node has exactly one
+    # parent.
+    __slots__ = ("_parents",)
+
+    _parents: tuple[Any, ...]
+
+    @property
+    def _key(self) -> object:
+        """Return the key identifying this node within its parent."""
+        raise NotImplementedError
+
+    def _attach_to(self, parent: "UniversityEntity") -> None:
+        # Views under the other parents record whether this node is shared.
+        for existing in self._parents:
+            existing._drop_view()
+        self._parents = (*self._parents, parent)
+
+    def _detach_from(self, parent: "UniversityEntity") -> None:
+        for index, existing in enumerate(self._parents):
+            if existing is parent:
+                for other in self._parents:
+                    other._drop_view()
+                self._parents = self._parents[:index] + self._parents[index + 1 :]
+                return
+
+    def _fields(self, refs: Optional[References]) -> dict[str, object]:
+        """Return ``to_dict()``; containers pass ``refs`` on to their children."""
+        return self.to_dict()  # type: ignore[attr-defined]
+
+    def _dump(self, refs: Optional[References]) -> dict[str, object]:
+        """Serialize like ``to_dict``, writing a shared node in full only once.
+
+        ``refs`` maps the nodes written so far to their IDs and is shared by the
+        whole document; without it every route gets its own full copy.
+        """
+        marker = shared_marker(self, refs)
+        if marker is None:
+            return self._fields(refs)
+        key, ref = marker
+        if key == REF_KEY:
+            return {REF_KEY: ref}
+        return {ID_KEY: ref, **self._fields(refs)}
+
+    @classmethod
+    def _build(cls, data: dict[str, Any], refs: dict[str, "Node"]) -> "Node":
+        return cls.from_dict(data)  # type: ignore[attr-defined]
+
+    @classmethod
+    def _load(cls, data: dict[str, Any], refs: dict[str, "Node"]) -> Any:
+        """Build a node from ``_dump`` output, resolving references through ``refs``."""
+        if REF_KEY in data:
+            return cls._resolve(data[REF_KEY], refs)
+        node = cls._build(data, refs)
+        if ID_KEY in data:
+            refs[str(data[ID_KEY])] = node
+        return node
+
+    @classmethod
+    def _resolve(cls, ref: object, refs: dict[str, "Node"]) -> Any:
+        node = refs.get(str(ref))
+        if node is None:
+            raise ValueError(f"Reference {ref!r} does not match an earlier {ID_KEY}")
+        if not isinstance(node, cls):
+            raise ValueError(f"Reference {ref!r} names a {type(node).__name__}, not a {cls.__name__}")
+        return node
+
+
+class UniversityEntity(Node, ABC):
     """Abstract base class that stores a name for a university entity."""
 
+    # ``_frozen`` is the last view built by ``Institute.snapshot`` and ``_stale`` is
+    # set once the entity changes, so the next snapshot rebuilds the view. The old
+    # view is kept until then: a group takes the views of its unchanged students
+    # from it, which spares students a view slot of their own.
+    __slots__ = ("_name", "_dirty", "_grade_totals", "_frozen", "_stale")
+
     def __init__(self, name: str) -> None:
         if not isinstance(name, str):
             raise TypeError("name must be a string")
         cleaned_name = name.strip()
         if not cleaned_name:
             raise ValueError("name cannot be empty or whitespace")
-        self._name = cleaned_name
+        self._name = sys.intern(cleaned_name)
+        self._parents = ()
+        # Child keys changed since the last incremental save, mapped to "attach",
+        # "detach" or "changed" (something inside the child changed).
+        self._dirty: dict[Any, str] = {}
+        self._grade_totals = GradeTotals()
+        self._frozen: Any = None
+        self._stale = True
 
     @property
     def name(self) -> str:
         """Return the entity name."""
         return self._name
 
+    @property
+    def _key(self) -> object:
+        return self._name
+
+    @property
+    def dirty(self) -> bool:
+        """Return whether anything below this entity changed since the last incremental save."""
+        return bool(self._dirty)
+
+    def _fields(self, refs: Optional[References]) -> dict[str, object]:
+        return self.to_dict(refs)  # type: ignore[attr-defined]
+
+    @classmethod
+    def _build(cls, data: dict[str, Any], refs: dict[str, Node]) -> Node:
+        return cls.from_dict(data, refs)  # type: ignore[attr-defined]
+
+    def _children(self) -> Iterable[Any]:
+        """Return the direct children held by this entity."""
+        return ()
+
+    def _child_collection(self) -> Optional[Any]:
+        """Return the keyed collection holding the direct children, if any."""
+        return None
+
+    def _mark_dirty(self, event: str, path: tuple[Any, ...]) -> None:
+        """Record which direct child an event is about for incremental saving."""
+        if event == "load":
+            return
+        key = path[0]._key
+        if len(path) == 1 and event in ("attach", "detach"):
+            # Re-inserting keeps the attached keys in the order they were appended.
+            self._dirty.pop(key, None)
+            self._dirty[key] = event
+        else:
+            self._dirty.setdefault(key, "changed")
+
+    def grade_stats(self) -> GradeStats:
+        """Return grade statistics of every student below this entity.
+
+        The totals are maintained as students come and go, so this is constant time
+        unless a departed student held the minimum or maximum grade.
+        """
+        totals = self._grade_totals
+        if totals.stale:
+            totals.refresh(self._child_extremes())
+        return totals.snapshot()
+
+    def _child_extremes(self) -> Iterable[tuple[float, float]]:
+        for child in self._children():
+            if isinstance(child, UniversityEntity):
+                stats = child.grade_stats()
+                if stats.count:
+                    yield stats.minimum, stats.maximum  # type: ignore[misc]
+            else:
+                yield child.average_grade, child.average_grade
+
+    def _update_totals(self, event: str, path: tuple[Any, ...], *args: Any) -> None:
+        """Fold an event reported by a descendant into the running grade totals."""
+        if event == "load":
+            return
+        node = path[-1]
+        totals = self._grade_totals
+        if event == "grade":
+            totals.remove(args[0])
+            totals.add(node.average_grade)
+        elif event in ("attach", "detach"):
+            if isinstance(node, UniversityEntity):
+                if event == "attach":
+                    totals.merge(node._grade_totals)
+                else:
+                    totals.unmerge(node._grade_totals)
+            elif event == "attach":
+                totals.add(node.average_grade)
+            else:
+                totals.remove(node.average_grade)
+
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        # Parents are left out so a copied subtree stands alone; each container
+        # links its children back as it is restored.
+        _, slots = super().__getstate__()  # type: ignore[misc]
+        del slots["_parents"], slots["_frozen"], slots["_stale"]
+        return None, slots
+
+    def __setstate__(self, state: tuple[None, dict[str, Any]]) -> None:
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        self._parents = ()
+        self._frozen = None
+        self._stale = True
+        for child in self._children():
+            child._parents = (*child._parents, self)
+
+    def _drop_view(self) -> None:
+        """Mark the frozen view of this entity and of every entity holding it as stale."""
+        if not self._stale:
+            self._stale = True
+            for parent in self._parents:
+                parent._drop_view()
+
+    def _clear_dirty(self) -> None:
+        """Forget the recorded changes for this entity and everything below it."""
+        self._dirty.clear()
+        for child in self._children():
+            if isinstance(child, UniversityEntity):
+                child._clear_dirty()
+
+    def _propagate(self, event: str, path: tuple[Any, ...], *args: object) -> None:
+        """Forward an event about a chain of descendants to every entity holding this one.
+
+        ``path`` starts with a direct child of this entity and ends with the node the
+        event is about. Each ancestor prepends itself, so the root receives the full path.
+        """
+        self._mark_dirty(event, path)
+        self._update_totals(event, path, *args)
+        self._stale = True
+        path = (self, *path)
+        for parent in self._parents:
+            parent._propagate(event, path, *args)
+
     def __str__(self) -> str:  # pragma: no cover - trivial override point
         return f"{self.__class__.__name__}: {self.name}"
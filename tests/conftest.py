@@ -0,0 +1,39 @@
+from typing import Callable, Iterable
+
+import pytest
+
+from institute import Course, Department, Faculty, Group, Institute, Student
+
+
+@pytest.fixture
+def make_institute() -> Callable[..., Institute]:
+    """Return a factory for the "Test" institute: course 1, faculty "Science", the given departments.
+
+    Without departments the faculty holds "Mathematics" with "Group A" of Ann Lee
+    (S1, 80) and Bo Kim (S2, 60). ``courses`` are added after course 1.
+    """
+
+    def make(*departments: Department, courses: Iterable[Course] = ()) -> Institute:
+        if not departments:
+            students = [Student("Ann", "Lee", "S1", 80.0), Student("Bo", "Kim", "S2", 60.0)]
+            departments = (Department("Mathematics", [Group("Group A", students)]),)
+        return Institute("Test", [Course(1, [Faculty("Science", list(departments))]), *courses])
+
+    return make
+
+
+@pytest.fixture
+def institute(make_institute) -> Institute:
+    return make_institute()
+
+
+@pytest.fixture
+def group(institute) -> Group:
+    """The first group of ``institute``."""
+    return institute.find_course(1).faculties[0].departments[0].groups[0]
+
+
+@pytest.fixture(params=["institute.json", "institute.bin"])
+def data_path(request, tmp_path):
+    """A data file path in each snapshot format."""
+    return tmp_path / request.param
@@ -0,0 +1,43 @@
+import io
+import json
+
+from institute import Institute
+from institute.batch import run_batch
+
+
+def run(institute: Institute, *operations: object) -> tuple[object, str, str]:
+    lines = [json.dumps(operation) if not isinstance(operation, str) else operation for operation in operations]
+    output, errors = io.StringIO(), io.StringIO()
+    report = run_batch(institute, lines, lambda path: None, output, errors)
+    return report, output.getvalue(), errors.getvalue()
+
+
+def test_malformed_nested_data_is_reported_per_line(institute):
+    report, output, errors = run(
+        institute,
+        {"op": "add", "path": "1", "data": {"name": "Arts", "departments": "abc"}},
+        {"op": "add", "path": "1/Science", "data": {"name": "Physics", "groups": [{"name": "G", "students": [1]}]}},
+        {"op": "add", "path": "1/Science/Mathematics/Group A", "data": "Bo"},
+        "[1, 2]",
+        {"op": "grade", "path": "1/Science/Mathematics/Group A/S1", "grade": 90},
+        {"op": "search", "id": "S1"},
+    )
+    assert report.operations == 6 and report.failed == 4
+    assert errors.splitlines() == [
+        "line 1: data.departments must be a list",
+        "line 2: data.groups[0].students[0] must be an object",
+        "line 3: data must be an object",
+        "line 4: operation must be a JSON object",
+    ]
+    assert json.loads(output) == {"line": 6, "matches": ["1/Science/Mathematics/Group A/S1"]}
+    assert institute.find_student_by_id("S1")[-1].average_grade == 90
+
+
+def test_nested_add_builds_the_subtree(institute):
+    student = {"first_name": "Bo", "last_name": "Kim", "student_id": "S2", "average_grade": 70}
+    report, _, errors = run(
+        institute,
+        {"op": "add", "path": "1/Science", "data": {"name": "Physics", "groups": [{"name": "G", "students": [student]}]}},
+    )
+    assert not report.failed and not errors
+    assert institute.resolve("1/Science/Physics/G/S2")[-1].full_name == "Bo Kim"
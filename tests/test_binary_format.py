@@ -0,0 +1,37 @@
+import pytest
+
+from institute import DataManager, Department, Group, Institute, Student
+
+
+@pytest.fixture
+def institute(make_institute) -> Institute:
+    groups = [
+        Group("Group A", [Student("Ann", "Lee", "S1", 91.5), Student("Bo", "Kim", "S2", 40.0)]),
+        Group("Empty"),
+        Group("Group B", [Student("Cy", "Fox", "S3", 100.0)]),
+    ]
+    return make_institute(Department("Mathematics", groups))
+
+
+def group_stats(institute: Institute) -> list:
+    department = institute.find_course(1).faculties[0].departments[0]
+    return [group.grade_stats() for group in department.groups] + [institute.grade_stats()]
+
+
+def test_lazy_load_has_stats_before_decoding(institute, tmp_path):
+    path = tmp_path / "institute.bin"
+    DataManager.save(institute, path, file_format="binary")
+    lazy = DataManager.load(path, lazy=True)
+    groups = lazy.find_course(1).faculties[0].departments[0].groups
+    assert all(group._loader is not None for group in groups if group.name != "Empty")
+    assert group_stats(lazy) == group_stats(institute)
+    assert lazy.to_dict() == institute.to_dict()
+    assert group_stats(lazy) == group_stats(institute)
+
+
+def test_eager_load_round_trip(institute, tmp_path):
+    path = tmp_path / "institute.bin"
+    DataManager.save(institute, path, file_format="binary")
+    loaded = DataManager.load(path)
+    assert loaded.to_dict() == institute.to_dict()
+    assert group_stats(loaded) == group_stats(institute)
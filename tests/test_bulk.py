@@ -0,0 +1,83 @@
+import pytest
+
+from institute import BulkImportError, Group, Student
+from institute.bulk import parse_rows
+
+ROW = (1, " Science ", "Mathematics", "Group B", "Cy", "Fox", "S3", "70.5")
+
+
+def test_parse_rows_normalises_valid_rows_and_reports_the_rest():
+    parsed, errors = parse_rows(
+        [
+            ROW,
+            ("2", "Arts", "History", "H1", "Di", "Ng", "S4", 55),
+            (7, "Arts", "History", "H1", "Di", "Ng", "S5", 55),
+            (1, "Arts", "History", "H1", "Di", "Ng", "S6", 101),
+            (1, "Arts", "  ", "H1", "Di", "Ng", "S7", 50),
+            (1, "Arts", "History", "H1", "Di", "Ng", "S8"),
+            ("one", "Arts", "History", "H1", "Di", "Ng", "S9", 50),
+            (1, "Arts", "History", "H1", "Di", "Ng", "S10", "high"),
+            (2.7, "Arts", "History", "H1", "Di", "Ng", "S11", 50),
+            ("2.7", "Arts", "History", "H1", "Di", "Ng", "S12", 50),
+            (True, "Arts", "History", "H1", "Di", "Ng", "S13", 50),
+            (3.0, "Arts", "History", "H1", "Di", "Ng", "S14", 50),
+        ]
+    )
+    assert parsed == [
+        (0, (1, "Science", "Mathematics", "Group B", "Cy", "Fox", "S3", 70.5)),
+        (1, (2, "Arts", "History", "H1", "Di", "Ng", "S4", 55.0)),
+        (11, (3, "Arts", "History", "H1", "Di", "Ng", "S14", 50.0)),
+    ]
+    assert [number for number, _ in errors] == [2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert errors[0][1] == "course must be between 1 and 6"
+    assert errors[1][1] == "average_grade must be between 0 and 100"
+    assert errors[2][1] == "department must be a non-empty string"
+    assert errors[3][1] == "expected 8 fields, got 7"
+    assert errors[4][1] == "course must be an integer"
+    assert {message for _, message in errors[6:]} == {"course must be an integer"}
+
+
+def test_import_rows_creates_missing_containers(institute):
+    added = institute.import_rows([ROW, (1, "Science", "Mathematics", "Group A", "Di", "Ng", "S4", 50)])
+    assert added == 2
+    assert institute.resolve("1/Science/Mathematics/Group B/S3")[-1].average_grade == 70.5
+    group = institute.resolve("1/Science/Mathematics/Group A")[-1]
+    assert [student.student_id for student in group.students] == ["S1", "S2", "S4"]
+    assert institute.find_students_by_name("fox")[0][-1].student_id == "S3"
+
+
+def test_rejected_import_changes_nothing(institute):
+    before = institute.to_dict()
+    with pytest.raises(BulkImportError) as raised:
+        institute.import_rows([ROW, ROW, (1, "Science", "Mathematics", "Group A", "Di", "Ng", "S1", 50), (9,)])
+    assert raised.value.errors == [
+        "row 1: student with id S3 already exists in group Group B",
+        "row 2: student with id S1 already exists in group Group A",
+        "row 3: expected 8 fields, got 1",
+    ]
+    assert institute.to_dict() == before
+
+
+def test_fractional_course_is_rejected_not_truncated(institute):
+    with pytest.raises(BulkImportError) as raised:
+        institute.import_rows([(2.7, "Science", "Mathematics", "Group A", "Di", "Ng", "S4", 50)])
+    assert raised.value.errors == ["row 0: course must be an integer"]
+    assert institute.find_course(2) is None
+
+
+def test_add_students_bulk_reports_every_duplicate(group):
+    with pytest.raises(BulkImportError) as raised:
+        group.add_students_bulk(
+            [Student("Cy", "Fox", "S1", 70.0), Student("Di", "Ng", "S3", 50.0), Student("Ed", "Oh", "S3", 1.0)]
+        )
+    assert len(raised.value.errors) == 2
+    assert [s.student_id for s in group.students] == ["S1", "S2"]
+    group.add_students_bulk([Student("Cy", "Fox", "S3", 70.0)])
+    assert group.grade_stats().count == 3
+
+
+def test_add_groups_bulk_rejects_existing_names(institute):
+    department = institute.find_course(1).faculties[0].departments[0]
+    with pytest.raises(BulkImportError):
+        department.add_groups_bulk([Group("Group B"), Group("Group A")])
+    assert [g.name for g in department.groups] == ["Group A"]
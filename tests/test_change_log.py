@@ -0,0 +1,49 @@
+from institute import DataManager, Department, Faculty, Group, Student
+from institute.data_manager import changes_path
+
+
+def test_load_replays_incremental_saves(institute, group, data_path):
+    assert DataManager.save_incremental(institute, data_path) == 0
+    assert not changes_path(data_path).exists()
+    group.students[0].update_average_grade(95.0)
+    group.add_student(Student("Cy", "Fox", "S3", 70.0))
+    assert DataManager.save_incremental(institute, data_path) > 0
+    group.remove_student("S2")
+    institute.find_course(1).add_faculty(Faculty("Arts", [Department("History", [Group("H1")])]))
+    assert DataManager.save_incremental(institute, data_path) > 0
+    assert DataManager.save_incremental(institute, data_path) == 0
+    loaded = DataManager.load(data_path)
+    assert loaded.to_dict() == institute.to_dict()
+    assert not loaded.dirty
+
+
+def test_load_skips_a_torn_final_record(institute, group, data_path):
+    DataManager.save_incremental(institute, data_path)
+    group.students[0].update_average_grade(95.0)
+    DataManager.save_incremental(institute, data_path)
+    with changes_path(data_path).open("a", encoding="utf-8") as handle:
+        handle.write('{"op":"delete","path":[1,"Sci')
+    assert DataManager.load(data_path).to_dict() == institute.to_dict()
+
+
+def test_log_of_an_older_snapshot_is_ignored(institute, group, data_path):
+    DataManager.save_incremental(institute, data_path)
+    group.students[0].update_average_grade(95.0)
+    DataManager.save_incremental(institute, data_path)
+    log = changes_path(data_path).read_text(encoding="utf-8")
+    group.students[0].update_average_grade(40.0)
+    DataManager.save(institute, data_path)
+    assert not changes_path(data_path).exists()
+    # A log left behind by a crash between the two writes no longer matches.
+    changes_path(data_path).write_text(log, encoding="utf-8")
+    assert DataManager.load(data_path).find_student_by_id("S1")[-1].average_grade == 40.0
+
+
+def test_compact_folds_the_log_into_the_snapshot(institute, group, data_path):
+    DataManager.save_incremental(institute, data_path)
+    group.remove_student("S1")
+    DataManager.save_incremental(institute, data_path)
+    DataManager.compact(data_path)
+    assert not changes_path(data_path).exists()
+    assert DataManager.load(data_path).to_dict() == institute.to_dict()
+    assert DataManager.detect_format(data_path) == ("binary" if data_path.suffix == ".bin" else "json")
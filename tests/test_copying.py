@@ -0,0 +1,44 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from institute import Department, Faculty, Group, Student
+
+
+def test_asdict_has_only_public_fields(institute):
+    student = institute.find_student_by_id("S1")[-1]
+    assert dataclasses.asdict(student) == student.to_dict()
+    assert dataclasses.replace(student, average_grade=1.0)._parents == ()
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, lambda node: pickle.loads(pickle.dumps(node))])
+def test_student_copies_leave_the_tree_behind(institute, clone):
+    student = institute.find_student_by_id("S1")[-1]
+    copied = clone(student)
+    assert copied == student and copied._parents == ()
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, lambda node: pickle.loads(pickle.dumps(node))])
+def test_institute_copy_is_independent(institute, clone):
+    institute.snapshot()
+    institute.top_students(1)
+    copied = clone(institute)
+    assert copied.to_dict() == institute.to_dict()
+    copied.find_student_by_id("S1")[-1].update_average_grade(10.0)
+    assert copied.grade_stats().total == 70.0
+    assert institute.grade_stats().total == 140.0
+    assert copied.top_students(1)[0][-1].student_id == "S2"
+    with copied.writing():
+        copied.find_course(1).remove_faculty("Science")
+    assert copied.find_student_by_id("S1") is None
+
+
+def test_shared_entity_is_copied_once():
+    group = Group("Shared", [Student("Ann", "Lee", "S1", 80.0)])
+    faculty = Faculty("Science", [Department("Mathematics", [group]), Department("Physics", [group])])
+    copied = pickle.loads(pickle.dumps(faculty))
+    first, second = (department.groups[0] for department in copied.departments)
+    assert first is second and len(first._parents) == 2
+    assert copied._parents == ()
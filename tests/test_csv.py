@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+from institute import DataManager, Institute
+from institute.csv_stream import read_csv, write_csv
+
+
+def test_round_trip(institute):
+    institute.find_student_by_id("S2")[-1].rename("Bö", "Kïm")
+    handle = io.StringIO()
+    assert write_csv(institute, handle) == 2
+    assert handle.getvalue().splitlines()[:2] == [
+        "course,faculty,department,group,first_name,last_name,student_id,average_grade",
+        "1,Science,Mathematics,Group A,Ann,Lee,S1,80.0",
+    ]
+    copy = Institute("Test")
+    assert read_csv(io.StringIO(handle.getvalue()), copy) == 2
+    assert copy.to_dict() == institute.to_dict()
+
+
+def test_columns_in_any_order_update_existing_students(institute):
+    rows = (
+        "student_id,average_grade,first_name,last_name,group,department,faculty,course\n"
+        "S1,95,Ann,Lee,Group A,Mathematics,Science,1\n"
+        "S2,60,Bob,Kim,Group A,Mathematics,Science,1\n"
+        "\n"
+        "S3,70,Cy,Fox,Group B,Mathematics,Science,2\n"
+    )
+    assert read_csv(io.StringIO(rows), institute) == 3
+    assert institute.find_student_by_id("S1")[-1].average_grade == 95.0
+    assert [path[-1].student_id for path in institute.find_students_by_name("bob")] == ["S2"]
+    assert institute.resolve("2/Science/Mathematics/Group B/S3")[-1].full_name == "Cy Fox"
+
+
+def test_invalid_row_names_its_line_and_keeps_earlier_rows(institute):
+    rows = (
+        "course,faculty,department,group,first_name,last_name,student_id,average_grade\n"
+        "1,Science,Mathematics,Group A,Cy,Fox,S3,70\n"
+        "1,Science,Mathematics,Group A,Di,Ng,S4,170\n"
+        "1,Science,Mathematics,Group A,Ed,Oh,S5,50\n"
+    )
+    with pytest.raises(ValueError, match="CSV line 3: average_grade must be between 0 and 100"):
+        read_csv(io.StringIO(rows), institute)
+    assert institute.find_student_by_id("S3") is not None
+    assert institute.find_student_by_id("S5") is None
+
+
+def test_header_must_name_every_column():
+    with pytest.raises(ValueError, match="missing columns: average_grade"):
+        read_csv(io.StringIO("course,faculty,department,group,first_name,last_name,student_id\n"), Institute("Test"))
+    assert read_csv(io.StringIO(""), Institute("Test")) == 0
+
+
+def test_files_round_trip(institute, tmp_path):
+    institute.find_student_by_id("S2")[-1].rename("Bö", "Kïm")
+    path = tmp_path / "students.csv"
+    assert DataManager.export_csv(institute, path) == 2
+    assert "Bö,Kïm" in path.read_bytes().decode("utf-8")
+    loaded = DataManager.import_csv(path)
+    assert loaded.name == "students"
+    assert loaded.find_course(1).to_dict() == institute.find_course(1).to_dict()
@@ -0,0 +1,95 @@
+import json
+import random
+from typing import Callable
+
+import pytest
+
+from institute import Course, Department, Faculty, Group, Institute, Student
+
+
+@pytest.fixture
+def build(make_institute) -> Callable[[], Institute]:
+    """Return a factory for identical institutes to diff against each other."""
+
+    def make() -> Institute:
+        groups = [
+            Group(f"Group {g}", [Student("Ann", "Lee", f"S{g}{s}", 50.0 + s) for s in range(4)]) for g in range(3)
+        ]
+        departments = [Department("Mathematics", groups[:2]), Department("Physics", groups[2:])]
+        return make_institute(*departments, courses=[Course(2)])
+
+    return make
+
+
+def synced(source: Institute, base: object, replica: Institute) -> None:
+    patch = json.loads(json.dumps(source.diff(base)))
+    replica.apply_patch(patch)
+    assert replica.to_dict() == source.to_dict()
+    assert source.diff(replica) == []
+
+
+def test_identical_institutes_have_no_changes(build):
+    institute = build()
+    assert institute.diff(build()) == []
+    assert institute.diff(institute.snapshot()) == []
+
+
+def test_grade_rename_add_and_remove(build):
+    source, replica = build(), build()
+    base = source.snapshot()
+    group = source.resolve("1/Science/Mathematics/Group 0")[-1]
+    group.update_student_grade("S00", 99.0)
+    group.find_student_by_id("S01").rename("Bo", "Kim")
+    group.remove_student("S02")
+    group.add_student(Student("New", "One", "N1", 70.0))
+    source.find_course(2).add_faculty(Faculty("Arts", [Department("History")]))
+    patch = source.diff(base)
+    assert {change["op"] for change in patch} == {"update", "delete", "add"}
+    synced(source, base, replica)
+
+
+def test_removed_and_readded_child_keeps_its_new_position(build):
+    source, replica = build(), build()
+    base = source.snapshot()
+    group = source.resolve("1/Science/Mathematics/Group 0")[-1]
+    student = group.remove_student("S00")
+    group.add_student(student)
+    assert [s.student_id for s in group.students] == ["S01", "S02", "S03", "S00"]
+    synced(source, base, replica)
+
+
+def test_new_child_ahead_of_kept_children():
+    source = Institute("Test", [Course(2), Course(1)])
+    target = Institute("Test", [Course(1)])
+    target.apply_patch(source.diff(target))
+    assert [course.number for course in target.courses] == [2, 1]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits_sync(build, seed):
+    rng = random.Random(seed)
+    source, replica = build(), build()
+    base = source.snapshot()
+    for serial in range(30):
+        path = rng.choice(source.find_students_by_name(""))
+        group, student = path[3], path[4]
+        action = rng.randrange(4)
+        if action == 0:
+            student.update_average_grade(rng.uniform(0.0, 100.0))
+        elif action == 1:
+            group.add_student(group.remove_student(student.student_id))
+        elif action == 2 and len(group.students) > 1:
+            group.remove_student(student.student_id)
+        else:
+            group.add_student(Student("Added", "Student", f"A{serial}", 60.0))
+    synced(source, base, replica)
+
+
+def test_patch_can_be_applied_twice(build):
+    source, replica = build(), build()
+    base = source.snapshot()
+    source.resolve("1/Science/Physics/Group 2")[-1].remove_student("S21")
+    patch = source.diff(base)
+    replica.apply_patch(patch)
+    replica.apply_patch(patch)
+    assert replica.to_dict() == source.to_dict()
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from institute import Department, Group, Institute, Student
+
+
+@pytest.fixture
+def shared() -> Student:
+    """A student held by both groups of ``institute``."""
+    return Student("Cy", "Fox", "S3", 70.0)
+
+
+@pytest.fixture
+def institute(make_institute, shared) -> Institute:
+    first = Group("Group A", [Student("Ann", "Lee", "S1", 80.0), Student("Bo", "Kim", "S2", 60.0), shared])
+    return make_institute(Department("Mathematics", [first, Group("Group B", [shared])]))
+
+
+def group_views(institute: Institute) -> tuple:
+    return institute.snapshot().courses[0].faculties[0].departments[0].groups
+
+
+def test_unchanged_students_keep_their_views(institute):
+    before = group_views(institute)[0]
+    institute.find_student_by_id("S2")[-1].update_average_grade(65.0)
+    after = group_views(institute)[0]
+    assert after is not before
+    assert after.students[0] is before.students[0]
+    assert after.students[1] is not before.students[1] and before.students[1].average_grade == 60.0
+    assert not hasattr(institute.find_student_by_id("S1")[-1], "_frozen")
+
+
+def test_shared_student_has_one_view(institute, shared):
+    first = group_views(institute)
+    shared.update_average_grade(75.0)
+    second = group_views(institute)
+    for views in (first, second):
+        assert views[0].students[2] is views[1].students[0]
+    assert second[0].students[2].average_grade == 75.0
+    document = json.dumps(institute.snapshot().to_dict())
+    assert institute.to_dict() == json.loads(document)
+
+
+def test_shifted_students_reuse_views_by_id(institute, group):
+    before = group_views(institute)[0]
+    group.remove_student("S1")
+    rebuilt = group_views(institute)[0]
+    assert [view.student_id for view in rebuilt.students] == ["S2", "S3"]
+    assert rebuilt.students[0] is before.students[1] and rebuilt.students[1] is before.students[2]
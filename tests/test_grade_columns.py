@@ -0,0 +1,68 @@
+import pytest
+
+from institute import Department, Group, Student
+from institute import grade_columns
+from institute.grade_columns import GradeColumn, means_by_child, percentile, students_at_least, summarize
+
+np = grade_columns.np
+needs_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+
+@needs_numpy
+def test_column_follows_group_changes(group):
+    column = group.grade_column()
+    group.remove_student("S1")
+    group.add_student(Student("Cy", "Ng", "S3", 95.0))
+    group.update_student_grade("S2", 70.0)
+    assert len(column) == 2
+    assert sorted(zip(column.ids().tolist(), column.grades().tolist())) == [("S2", 70.0), ("S3", 95.0)]
+
+
+@needs_numpy
+def test_column_grows_and_reuses_holes():
+    column = GradeColumn([])
+    for number in range(20):
+        column.add(Student("A", "B", f"S{number}", float(number)))
+    column.remove("S3")
+    column.add(Student("A", "B", "S99", 99.0))
+    assert len(column) == 20
+    assert len(column.grades()) == 20 and 3.0 not in column.grades().tolist()
+    assert column.ids().tolist()[3] == "S99"
+
+
+@needs_numpy
+def test_aggregates_over_the_subtree(make_institute):
+    institute = make_institute(
+        Department("Mathematics", [Group("G1", [Student("A", "A", "S1", 80.0), Student("B", "B", "S2", 60.0)])]),
+        Department("Physics", [Group("G2", [Student("C", "C", "S3", 100.0)]), Group("Empty", [])]),
+    )
+    faculty = institute.find_course(1).faculties[0]
+    summary = summarize(institute)
+    assert summary["count"] == 3 and summary["mean"] == 80.0
+    assert (summary["min"], summary["max"]) == (60.0, 100.0)
+    assert summary["std"] == pytest.approx(np.std([80.0, 60.0, 100.0]))
+    assert percentile(faculty, 50) == 80.0
+    assert sorted(students_at_least(institute, 80.0)) == ["S1", "S3"]
+    assert means_by_child(faculty) == {"Mathematics": 70.0, "Physics": 100.0}
+    with pytest.raises(ValueError):
+        percentile(faculty, 101)
+
+
+@needs_numpy
+def test_empty_subtree(make_institute):
+    institute = make_institute(Department("Mathematics", [Group("Empty", [])]))
+    assert summarize(institute)["count"] == 0
+    with pytest.raises(ValueError, match="No students"):
+        percentile(institute, 50)
+
+
+def test_without_numpy_only_the_column_functions_fail(group, monkeypatch):
+    monkeypatch.setattr(grade_columns, "np", None)
+    with pytest.raises(ImportError, match="numpy is required"):
+        group.grade_column()
+    with pytest.raises(ImportError, match="numpy is required"):
+        summarize(group)
+    group.add_student(Student("Cy", "Ng", "S3", 95.0))
+    group.update_student_grade("S3", 90.0)
+    assert group.remove_student("S1").student_id == "S1"
+    assert [student.student_id for student in group.students] == ["S2", "S3"]
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from institute import Department, Group, Institute, Student
+from institute import institute as institute_module
+
+
+@pytest.fixture
+def institute(make_institute) -> Institute:
+    rng = random.Random(0)
+    departments = [
+        Department(
+            f"Department {d}",
+            [
+                Group(f"Group {g}", [Student("Ann", "Lee", f"S{d}{g}{s}", rng.uniform(0, 100)) for s in range(5)])
+                for g in range(3)
+            ],
+        )
+        for d in range(2)
+    ]
+    return make_institute(*departments)
+
+
+def grades_below(institute, scope):
+    paths = institute.find_students_by_name("")
+    return sorted(p[-1].average_grade for p in paths if scope is None or any(node is scope for node in p))
+
+
+def test_scoped_indexes_follow_changes(institute):
+    rng = random.Random(1)
+    faculty = institute.find_course(1).faculties[0]
+    scopes = [None, faculty, faculty.departments[0], faculty.departments[1].groups[2]]
+    for scope in scopes:
+        institute.top_students(1, scope=scope)
+    for serial in range(100):
+        path = rng.choice(institute.find_students_by_name(""))
+        if serial % 3 == 0:
+            path[-1].update_average_grade(rng.uniform(0, 100))
+        elif serial % 3 == 1 and len(path[3].students) > 1:
+            path[3].remove_student(path[-1].student_id)
+        else:
+            path[3].add_student(Student("New", "One", f"N{serial}", rng.uniform(0, 100)))
+    for scope in scopes:
+        found = [p[-1].average_grade for p in institute.bottom_students(1000, scope=scope)]
+        assert found == grades_below(institute, scope)
+
+
+def test_index_cache_is_bounded(institute, monkeypatch):
+    monkeypatch.setattr(institute_module, "_GRADE_INDEX_LIMIT", 2)
+    groups = [group for department in institute.find_course(1).faculties[0].departments for group in department.groups]
+    for group in groups:
+        institute.top_students(1, scope=group)
+    assert len(institute._grade_indexes) == 2
+    assert institute.top_students(1, scope=groups[0])[0][3] is groups[0]
+
+
+def test_detached_scope_drops_its_index(institute):
+    department = institute.find_course(1).faculties[0].departments[0]
+    group = department.groups[0]
+    institute.top_students(1, scope=group)
+    department.remove_group(group.name)
+    assert id(group) not in institute._grade_indexes
+    assert institute.top_students(1, scope=group) == []
+
+
+def test_shared_scope_keeps_its_index_while_reachable(institute):
+    first, second = institute.find_course(1).faculties[0].departments
+    shared = Group("Shared", [Student("Bo", "Kim", "X1", 50.0)])
+    first.add_group(shared)
+    second.add_group(shared)
+    assert len(institute.top_students(5, scope=shared)) == 2
+    first.remove_group("Shared")
+    assert len(institute.top_students(5, scope=shared)) == 1
+    second.remove_group("Shared")
+    assert id(shared) not in institute._grade_indexes
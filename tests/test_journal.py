@@ -0,0 +1,92 @@
+import json
+import threading
+
+import pytest
+
+from institute import DataManager, Institute, Student
+from institute.data_manager import _save_executor
+from institute.journal import Journal, journal_path
+
+
+def grade(institute: Institute, student_id: str) -> float:
+    return institute.find_student_by_id(student_id)[-1].average_grade
+
+
+def test_replay_restores_journaled_changes(institute, group, data_path):
+    journal = Journal(data_path, institute)
+    group.students[0].update_average_grade(95.0)
+    group.students[1].rename("Bob", "Kim")
+    group.add_student(Student("Cy", "Fox", "S3", 70.0))
+    group.remove_student("S1")
+    journal.close()
+    loaded = DataManager.load(data_path)
+    assert loaded.find_student_by_id("S3") is None
+    assert Journal.replay(loaded, data_path) == 4
+    assert loaded.to_dict() == institute.to_dict()
+
+
+def test_replay_skips_a_torn_final_record(institute, group, data_path):
+    journal = Journal(data_path, institute)
+    group.students[0].update_average_grade(95.0)
+    journal.close()
+    with journal_path(data_path).open("a", encoding="utf-8") as handle:
+        handle.write('{"op":"update","path":[1,"Science","Mathematics","Group A","S2"],"da')
+    loaded = DataManager.load(data_path)
+    assert Journal.replay(loaded, data_path) == 1
+    assert loaded.to_dict() == institute.to_dict()
+
+
+def test_replay_rejects_a_corrupt_complete_record(institute, data_path):
+    journal = Journal(data_path, institute)
+    journal.close()
+    with journal_path(data_path).open("a", encoding="utf-8") as handle:
+        handle.write('{"op":\n')
+    with pytest.raises(json.JSONDecodeError):
+        Journal.replay(DataManager.load(data_path), data_path)
+
+
+def test_journal_of_an_older_snapshot_is_ignored(institute, group, data_path):
+    journal = Journal(data_path, institute)
+    group.students[0].update_average_grade(95.0)
+    journal.close()
+    group.students[1].update_average_grade(10.0)
+    DataManager.save(institute, data_path)
+    loaded = DataManager.load(data_path)
+    assert Journal.replay(loaded, data_path) == 0
+    assert grade(loaded, "S1") == 95.0 and grade(loaded, "S2") == 10.0
+    # Opening the journal against the new snapshot starts it afresh.
+    Journal(data_path, loaded).close()
+    assert journal_path(data_path).read_text(encoding="utf-8").count("\n") == 1
+
+
+def test_background_checkpoint_carries_later_records(institute, group, data_path):
+    journal = Journal(data_path, institute)
+    group.students[0].update_average_grade(10.0)
+    release = threading.Event()
+    _save_executor.submit(release.wait)
+    try:
+        future = journal.checkpoint_background()
+        # Made after the institute was frozen, so only the journal has them.
+        group.students[1].update_average_grade(20.0)
+        group.add_student(Student("Cy", "Fox", "S3", 70.0))
+    finally:
+        release.set()
+    future.result()
+    group.students[0].update_average_grade(30.0)
+    journal.close()
+    loaded = DataManager.load(data_path)
+    assert grade(loaded, "S1") == 10.0 and grade(loaded, "S2") == 60.0
+    assert Journal.replay(loaded, data_path) == 3
+    assert loaded.to_dict() == institute.to_dict()
+
+
+def test_missing_journal_starts_empty_without_rewriting_the_snapshot(institute, group, data_path):
+    DataManager.save(institute, data_path)
+    written = data_path.read_bytes()
+    journal = Journal(data_path, institute)
+    group.students[0].update_average_grade(95.0)
+    journal.close()
+    assert data_path.read_bytes() == written
+    loaded = DataManager.load(data_path)
+    assert Journal.replay(loaded, data_path) == 1
+    assert loaded.to_dict() == institute.to_dict()
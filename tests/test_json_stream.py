@@ -0,0 +1,36 @@
+import io
+import json
+
+import pytest
+
+from institute.json_stream import JsonStreamReader
+
+VALUES = [
+    {"a": 'x}"]\\{[', "b": [1, 2.5e3, {"c": "\\"}], "d": "ünï"},
+    [],
+    {},
+    [[["}"]]],
+    {"k": '\\"'},
+    {"x": [{"y": '\\\\"'}]},
+    {"$ref": "1"},
+    "text",
+    12.5,
+    -3e-7,
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_read_raw_returns_each_value(chunk_size, ensure_ascii):
+    texts = [json.dumps(value, ensure_ascii=ensure_ascii) for value in VALUES]
+    reader = JsonStreamReader(io.StringIO("[ " + " ,\n ".join(texts) + " ]"), chunk_size=chunk_size)
+    raw = [reader.read_raw() for _ in reader.iter_array()]
+    reader.expect_end()
+    assert raw == texts
+
+
+def test_read_raw_rejects_an_unterminated_value():
+    reader = JsonStreamReader(io.StringIO('[{"a": ["b"'), chunk_size=4)
+    next(reader.iter_array())
+    with pytest.raises(json.JSONDecodeError):
+        reader.read_raw()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from institute.locking import ReadWriteLock
+
+
+def start(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_until(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_readers_share_and_writer_may_read():
+    lock = ReadWriteLock()
+    with lock.read():
+        entered = threading.Event()
+
+        def reader():
+            with lock.read():
+                entered.set()
+
+        start(reader).join(5)
+        assert entered.is_set()
+    with lock.write(), lock.write(), lock.read():
+        assert lock._writer == threading.get_ident()
+    assert lock._writer is None and lock._readers == 0
+
+
+def test_reader_cannot_upgrade():
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with lock.write():
+        pass
+
+
+def test_waiting_writer_goes_before_new_readers():
+    lock = ReadWriteLock()
+    order = []
+    lock.acquire_read()
+
+    def writer():
+        with lock.write():
+            order.append("writer")
+
+    def reader():
+        with lock.read():
+            order.append("reader")
+
+    writer_thread = start(writer)
+    wait_until(lambda: lock._writers_waiting == 1)
+    reader_thread = start(reader)
+    # The held read lock is still reentrant for its own thread.
+    with lock.read():
+        time.sleep(0.05)
+    assert order == []
+    lock.release_read()
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert order == ["writer", "reader"]
+
+
+def test_institute_writes_wait_for_readers(institute, group):
+    finished = threading.Event()
+
+    def write():
+        with institute.writing():
+            group.update_student_grade("S1", 10.0)
+        finished.set()
+
+    with institute.reading():
+        thread = start(write)
+        wait_until(lambda: institute._lock._writers_waiting == 1)
+        assert not finished.is_set()
+        assert institute.find_student_by_id("S1")[-1].average_grade == 80.0
+    thread.join(5)
+    assert finished.is_set() and institute.find_student_by_id("S1")[-1].average_grade == 10.0
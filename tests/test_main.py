@@ -0,0 +1,35 @@
+from institute import DataManager
+from institute import main as console
+from institute.journal import journal_path
+
+
+def test_journal_failure_keeps_the_loaded_institute(institute, tmp_path, monkeypatch, capsys):
+    path = tmp_path / "institute.json"
+    DataManager.save(institute, path)
+
+    def refuse(*args, **kwargs):
+        raise PermissionError("journal is read-only")
+
+    monkeypatch.setattr(console.Journal, "__init__", refuse)
+    monkeypatch.setattr("builtins.input", lambda prompt: "Replacement")
+    loaded, journal = console.load_initial_institute(path)
+    assert journal is None
+    assert loaded.to_dict() == institute.to_dict()
+    assert "journal is read-only" in capsys.readouterr().out
+    assert not journal_path(path).exists()
+
+
+def test_load_data_offers_the_configured_file(institute, tmp_path, monkeypatch, capsys):
+    path = tmp_path / "institute.json"
+    DataManager.save(institute, path)
+    prompts = []
+    answers = iter(["15", "", "0"])
+
+    def answer(prompt):
+        prompts.append(prompt)
+        return next(answers)
+
+    monkeypatch.setattr("builtins.input", answer)
+    console.main(["--data", str(path)])
+    assert f"Enter file path [{path}]: " in prompts
+    assert capsys.readouterr().out.count(f"Loaded institute 'Test' from {path}.") == 2
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from institute import Department, Group, Institute, Student
+
+FRAGMENTS = ["", "a", "AB", "ab c", "bc", "c x", "Ab Xy", "zzz", "b xy", "AAA"]
+
+
+def scan(institute: Institute, fragment: str) -> list:
+    """The substring scan the index replaced, in traversal order."""
+    return [
+        (course, faculty, department, group, student)
+        for course in institute.courses
+        for faculty in course.faculties
+        for department in faculty.departments
+        for group in department.groups
+        for student in group.find_students_by_name(fragment)
+    ]
+
+
+def name(rng: random.Random) -> str:
+    return "".join(rng.choice("abc") for _ in range(rng.randint(1, 4))).capitalize()
+
+
+@pytest.fixture
+def institute(make_institute) -> Institute:
+    rng = random.Random(0)
+    groups = [
+        Group(f"Group {g}", [Student(name(rng), name(rng), f"S{g}{s}", 50.0) for s in range(6)]) for g in range(4)
+    ]
+    # The last two groups are held by both departments, so their students have two paths.
+    return make_institute(Department("Mathematics", groups), Department("Physics", groups[2:]))
+
+
+def assert_matches_scan(institute: Institute) -> None:
+    for fragment in FRAGMENTS:
+        expected = [tuple(map(id, path)) for path in scan(institute, fragment)]
+        assert [tuple(map(id, path)) for path in institute.find_students_by_name(fragment)] == expected, fragment
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_results_follow_the_scan_through_edits(institute, seed):
+    rng = random.Random(seed)
+    assert_matches_scan(institute)
+    for serial in range(40):
+        path = rng.choice(institute.find_students_by_name(""))
+        group, student = path[3], path[4]
+        action = rng.randrange(4)
+        if action == 0:
+            student.rename(name(rng), rng.choice(["Xy", "Bc", name(rng)]))
+        elif action == 1 and len(group.students) > 1:
+            group.remove_student(student.student_id)
+        elif action == 2:
+            # A student moved to the end of the group changes the result order.
+            group.add_student(group.remove_student(student.student_id))
+        else:
+            group.add_student(Student(name(rng), name(rng), f"N{serial}", 60.0))
+        assert_matches_scan(institute)
+
+
+def test_same_id_with_different_names(institute, group):
+    other = institute.find_course(1).faculties[0].departments[0].groups[1]
+    other.add_student(Student("Zzz", "Qq", group.students[0].student_id, 70.0))
+    assert [path[-1].full_name for path in institute.find_students_by_name("zzz")] == ["Zzz Qq"]
+    assert_matches_scan(institute)
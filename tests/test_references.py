@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from institute import DataManager, Department, Group, Institute, Student
+
+
+@pytest.fixture
+def institute(make_institute) -> Institute:
+    shared = Group("Shared", [Student("Ann", "Lee", "S1", 80.0)])
+    return make_institute(Department("Mathematics", [shared]), Department("Physics", [shared]))
+
+
+def test_save_writes_plain_documents_by_default(institute, tmp_path):
+    path = tmp_path / "institute.json"
+    DataManager.save(institute, path)
+    DataManager.save_background(institute, tmp_path / "background.json").result()
+    for written in (path, tmp_path / "background.json"):
+        assert "$id" not in written.read_text(encoding="utf-8")
+        assert json.loads(written.read_text(encoding="utf-8")) == institute.to_dict()
+    first, second = DataManager.load(path).find_course(1).faculties[0].departments
+    assert first.groups[0] is not second.groups[0]
+
+
+def test_references_keep_the_sharing(institute, tmp_path):
+    path = tmp_path / "institute.json"
+    DataManager.save(institute, path, references=True)
+    assert json.loads(path.read_text(encoding="utf-8")) == institute.to_dict(references=True)
+    first, second = DataManager.load(path).find_course(1).faculties[0].departments
+    assert first.groups[0] is second.groups[0]
+
+
+def test_parent_outside_the_document_does_not_share(institute, tmp_path):
+    faculty = institute.find_course(1).faculties[0]
+    physics = faculty.remove_department("Physics")
+    group = faculty.departments[0].groups[0]
+    # The detached department still holds the group, but it is not written.
+    assert group._parents == (faculty.departments[0], physics)
+    data = institute.to_dict(references=True)
+    assert "$id" not in json.dumps(data)
+    assert Institute.from_dict(data).to_dict(references=True) == data
+    path = tmp_path / "institute.json"
+    DataManager.save(institute.snapshot(), path, references=True)
+    assert json.loads(path.read_text(encoding="utf-8")) == data
+
+
+def test_shared_student_is_written_once(make_institute):
+    student = Student("Bo", "Kim", "S2", 60.0)
+    institute = make_institute(Department("Mathematics", [Group("A", [student]), Group("B", [student])]))
+    groups = institute.to_dict(references=True)["courses"][0]["faculties"][0]["departments"][0]["groups"]
+    assert groups[0]["students"][0]["$id"] == "1" and groups[1]["students"] == [{"$ref": "1"}]
+    loaded = Institute.from_dict(institute.to_dict(references=True))
+    first, second = loaded.find_course(1).faculties[0].departments[0].groups
+    assert first.students[0] is second.students[0]
@@ -0,0 +1,55 @@
+import pytest
+
+from institute import Department, Group, Student
+from institute import institute as institute_module
+
+GROUP_PATH = "1/Science/Mathematics/Group A"
+
+
+def test_paths_resolve_to_their_entities(institute, group):
+    department = institute.find_course(1).faculties[0].departments[0]
+    assert institute.resolve("1") == (institute.find_course(1),)
+    assert institute.resolve(" 1 / Science/Mathematics ")[-1] is department
+    assert institute.resolve(GROUP_PATH + "/S2")[-2:] == (group, group.students[1])
+    assert institute.resolve(GROUP_PATH) is institute.resolve(GROUP_PATH)
+
+
+@pytest.mark.parametrize(
+    "path, message",
+    [("x/Science", "Invalid course number"), ("1//Mathematics", "Invalid path"), ("1/Arts", "No entity found")],
+)
+def test_bad_paths(institute, path, message):
+    with pytest.raises(ValueError, match=message):
+        institute.resolve(path)
+
+
+def test_detach_drops_cached_paths(institute, group):
+    department = institute.find_course(1).faculties[0].departments[0]
+    institute.resolve(GROUP_PATH + "/S1")
+    group.remove_student("S1")
+    with pytest.raises(ValueError, match="No entity found"):
+        institute.resolve(GROUP_PATH + "/S1")
+    department.remove_group("Group A")
+    with pytest.raises(ValueError, match="No entity found"):
+        institute.resolve(GROUP_PATH)
+    replacement = Group("Group A", [Student("Cy", "Fox", "S1", 70.0)])
+    department.add_group(replacement)
+    assert institute.resolve(GROUP_PATH + "/S1")[-2:] == (replacement, replacement.students[0])
+
+
+def test_detaching_one_route_of_a_shared_group(institute, group):
+    faculty = institute.find_course(1).faculties[0]
+    faculty.add_department(Department("Physics", [group]))
+    physics_path = "1/Science/Physics/Group A/S2"
+    assert institute.resolve(physics_path)[-1] is group.students[1]
+    faculty.remove_department("Physics")
+    with pytest.raises(ValueError, match="No entity found"):
+        institute.resolve(physics_path)
+    assert institute.resolve(GROUP_PATH + "/S2")[-1] is group.students[1]
+
+
+def test_cache_starts_over_when_full(institute, monkeypatch):
+    monkeypatch.setattr(institute_module, "_RESOLVE_CACHE_SIZE", 2)
+    for path in ("1", "1/Science", "1/Science/Mathematics"):
+        institute.resolve(path)
+    assert list(institute._resolved) == ["1/Science/Mathematics"]
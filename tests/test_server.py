@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from institute.server import QueryClient, QueryServer
+
+
+def serve(institute, session):
+    """Run ``session(client, server)`` against a server on a free local port."""
+
+    async def run():
+        server = QueryServer(institute)
+        listener = await server.start(port=0)
+        client = await QueryClient.connect(port=listener.sockets[0].getsockname()[1])
+        try:
+            return await session(client, server)
+        finally:
+            await client.close()
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+    return asyncio.run(run())
+
+
+def test_queries(institute):
+    async def session(client, server):
+        path = institute.find_student_by_id("S1")
+        assert await client.query("ID", "S1") == {"path": "1/Science/Mathematics/Group A/S1", "student": path[-1].to_dict()}
+        assert await client.query("ID", "missing") is None
+        assert [found["path"] for found in await client.query("NAME", "kim")] == ["1/Science/Mathematics/Group A/S2"]
+        assert await client.query("GROUP", "Group A") == "1/Science/Mathematics/Group A"
+        assert await client.query("DEPARTMENT", "Mathematics") == "1/Science/Mathematics"
+        stats = await client.query("STATS")
+        assert stats["count"] == 2 and stats["mean"] == 70.0
+        assert (await client.query("STATS", "1/Science/Mathematics/Group A"))["maximum"] == 80.0
+        with pytest.raises(ValueError, match="unknown command"):
+            await client.query("DROP", "S1")
+        with pytest.raises(ValueError, match="missing argument"):
+            await client.query("ID")
+        with pytest.raises(ValueError, match="No entity found"):
+            await client.query("STATS", "1/Arts")
+
+    serve(institute, session)
+
+
+def test_grade_update_clears_the_cache(institute, group):
+    async def session(client, server):
+        assert (await client.query("ID", "S1"))["student"]["average_grade"] == 80.0
+        await client.query("ID", "S1")
+        assert server.answer.cache_info().hits == 1
+        group.update_student_grade("S1", 95.0)
+        assert server.answer.cache_info().currsize == 0
+        assert (await client.query("ID", "S1"))["student"]["average_grade"] == 95.0
+        assert (await client.query("STATS"))["maximum"] == 95.0
+
+    serve(institute, session)